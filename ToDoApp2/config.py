@@ -3,7 +3,7 @@ Configuration management for the FastAPI application.
 Uses Pydantic Settings for environment variable management.
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 import os
 
 
@@ -17,12 +17,69 @@ class Settings(BaseSettings):
     # MongoDB
     mongodb_url: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     mongodb_db_name: str = os.getenv("MONGODB_DB_NAME", "todoapp")
+    # Index sync at startup: "sync" builds missing indexes, "verify" only reports
+    # them (fast restarts), "off" skips the check entirely.
+    mongodb_index_mode: str = "sync"
     
     # Security
     secret_key: str = os.getenv('SECRET_KEY', 'change-me-in-production-use-a-secure-random-key')
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 20
+    refresh_token_expire_days: int = 14
+    # The refresh token is only ever an HttpOnly cookie; turn Secure off
+    # only for plain-http development on a non-localhost host
+    refresh_cookie_secure: bool = True
+
+    # Password hashing pool ("thread" or "process" executor)
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 64
+    password_hash_retry_after_seconds: int = 1
+
+    # Verified-token cache used by get_current_user
+    token_cache_enabled: bool = True
+    token_cache_size: int = 10000
     
+    # Pagination
+    todo_page_size: int = 50
+    todo_page_size_max: int = 200
+
+    # Read-through cache of todo pages: "memory" (per process) or "redis"
+    todo_cache_enabled: bool = True
+    todo_cache_backend: str = "memory"
+    todo_cache_size: int = 10000
+    todo_cache_fields_per_owner: int = 64
+    todo_cache_ttl_seconds: float = 30.0
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Templates: bytecode cache dir (None = Jinja's temp dir), reload on
+    # change (None = follow debug) and the rendered todo row cache
+    template_bytecode_cache_dir: Optional[str] = None
+    template_auto_reload: Optional[bool] = None
+    template_row_cache_enabled: bool = True
+    template_row_cache_size: int = 5000
+    # Stream the todo page (rows sent as they are read) instead of rendering
+    # it in one piece; the streamed first page holds todo_page_size_max rows
+    stream_todo_page: bool = False
+    # Resolve url_for('static', ...) through static/dist/manifest.json (built
+    # by `python -m ToDoApp2.tools.assets`); without a manifest it is a no-op
+    static_fingerprint: bool = True
+
+    # Response compression: zstd (needs the zstandard package), then gzip.
+    # Static files are served precompressed, so /static is excluded.
+    compression_enabled: bool = True
+    compression_minimum_size: int = 500
+    compression_gzip_level: int = 6
+    compression_zstd_level: int = 3
+    compression_exclude_paths: List[str] = ["/static"]
+    compression_exclude_content_types: List[str] = [
+        "image/", "video/", "audio/", "font/", "application/zip", "application/gzip",
+        "text/event-stream",
+    ]
+
+    # Admin export
+    admin_export_batch_size: int = 500
+
     # Server
     host: str = "0.0.0.0"
     port: int = 8081
@@ -30,12 +87,42 @@ class Settings(BaseSettings):
 
     # Daily lifecycle + notifications
     daily_reset_enabled: bool = True
+    # "per_user" resets each user at their local midnight, checked every
+    # reset_check_minutes; "global" resets everyone at 23:59 in `timezone`
+    reset_mode: str = "per_user"
+    reset_check_minutes: int = 5
+    reset_batch_size: int = 500
+    # Scheduled jobs run in one process only, coordinated by a Mongo lease
+    job_lease_ttl_seconds: int = 60
+    job_lease_retention_hours: int = 24
+    # Daily purge: "batched" deletes _id ranges with a pause in between,
+    # "swap" replaces the whole collection with an empty one (global reset
+    # mode only; it ignores the cutoff, so todos added while the job runs
+    # are dropped unsummarised)
+    purge_mode: str = "batched"
+    purge_batch_size: int = 1000
+    purge_batch_pause_ms: int = 100
+    purge_dry_run: bool = False
+    # Copy each user's day of todos into todo_history before purging
+    archive_enabled: bool = False
+    # Nightly rebuild of the user_stats counters from the todos
+    stats_reconcile_enabled: bool = True
+    stats_reconcile_hour: int = 3
     summary_email_enabled: bool = False
     smtp_host: str = "smtp.gmail.com"
     smtp_port: int = 587
     smtp_username: Optional[str] = None
     smtp_password: Optional[str] = None
     smtp_use_tls: bool = True
+    smtp_pool_size: int = 4
+    smtp_max_messages_per_connection: int = 100
+
+    # Email outbox worker
+    outbox_workers: int = 4
+    outbox_poll_seconds: float = 5.0
+    outbox_lock_seconds: int = 120
+    outbox_max_attempts: int = 5
+    outbox_retry_base_seconds: int = 30
     email_from: Optional[str] = None
     sender_email: Optional[str] = None
     
@@ -0,0 +1,207 @@
+"""
+Read-through cache for per-user todo pages, with an in-process LRU backend
+and an optional Redis backend.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Values are grouped under one key per owner, so a write can drop everything
+    cached for that owner at once. Fields within a key identify the page.
+    """
+
+    name = 'none'
+
+    def __init__(self, ttl_seconds: float = 30, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, key: str, field: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss (or when disabled)."""
+        if not self.enabled:
+            return None
+        value = await self._get(key, field)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, field: str, value: Any) -> None:
+        if self.enabled:
+            await self._set(key, field, value)
+
+    async def invalidate(self, key: str) -> None:
+        """Drop every field cached under `key`."""
+        if self.enabled:
+            self.invalidations += 1
+            await self._invalidate(key)
+
+    async def close(self) -> None:
+        pass
+
+    async def _get(self, key: str, field: str) -> Optional[Any]:
+        return None
+
+    async def _set(self, key: str, field: str, value: Any) -> None:
+        pass
+
+    async def _invalidate(self, key: str) -> None:
+        pass
+
+    def _size(self) -> Optional[int]:
+        return None
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.name,
+            'enabled': self.enabled,
+            'size': self._size(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process cache bounded to `max_keys` owners (least recently used are
+    evicted), `max_fields` per owner (oldest written are evicted) and
+    `ttl_seconds` per field. Values are stored as-is, so callers must not
+    mutate what they get back.
+    """
+
+    name = 'memory'
+
+    def __init__(
+        self,
+        max_keys: int = 10000,
+        ttl_seconds: float = 30,
+        enabled: bool = True,
+        max_fields: int = 64,
+    ):
+        super().__init__(ttl_seconds=ttl_seconds, enabled=enabled and max_keys > 0)
+        self.max_keys = max_keys
+        self.max_fields = max(1, max_fields)
+        self._entries: 'OrderedDict[str, OrderedDict[str, Tuple[float, Any]]]' = OrderedDict()
+
+    async def _get(self, key: str, field: str) -> Optional[Any]:
+        fields = self._entries.get(key)
+        if fields is None:
+            return None
+        entry = fields.get(field)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del fields[field]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def _set(self, key: str, field: str, value: Any) -> None:
+        fields = self._entries.setdefault(key, OrderedDict())
+        now = time.monotonic()
+        fields.pop(field, None)
+        fields[field] = (now + self.ttl_seconds, value)
+        # Fields of a superseded list version are never read again; drop
+        # them as they expire and cap the rest.
+        for stale in [name for name, (expires_at, _) in fields.items() if expires_at <= now]:
+            del fields[stale]
+        while len(fields) > self.max_fields:
+            fields.popitem(last=False)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+
+    async def _invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def _size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by every worker in a Redis-protocol server: one hash per
+    owner, JSON values, and a TTL on the hash refreshed on every write.
+    Redis errors are logged and treated as misses.
+    """
+
+    name = 'redis'
+
+    def __init__(self, client, ttl_seconds: float = 30, prefix: str = 'todos:', enabled: bool = True):
+        super().__init__(ttl_seconds=ttl_seconds, enabled=enabled)
+        self.client = client
+        self.prefix = prefix
+        self.errors = 0
+
+    async def _get(self, key: str, field: str) -> Optional[Any]:
+        try:
+            raw = await self.client.hget(self.prefix + key, field)
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Redis cache read failed: %s", exc)
+            return None
+        return None if raw is None else json.loads(raw)
+
+    async def _set(self, key: str, field: str, value: Any) -> None:
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hset(self.prefix + key, field, json.dumps(value, separators=(',', ':')))
+                pipe.expire(self.prefix + key, max(1, int(self.ttl_seconds)))
+                await pipe.execute()
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Redis cache write failed: %s", exc)
+
+    async def _invalidate(self, key: str) -> None:
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Redis cache invalidation failed: %s", exc)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> Dict:
+        return {**super().stats(), 'errors': self.errors}
+
+
+def build_todo_cache() -> CacheBackend:
+    """Create the todo page cache configured in settings."""
+    enabled = settings.todo_cache_enabled
+    ttl = settings.todo_cache_ttl_seconds
+    if settings.todo_cache_backend == 'redis':
+        try:
+            import redis.asyncio as redis  # optional dependency
+        except ImportError:
+            logger.warning("TODO_CACHE_BACKEND=redis but the redis package is missing; using memory.")
+        else:
+            return RedisCacheBackend(
+                redis.from_url(settings.redis_url), ttl_seconds=ttl, enabled=enabled
+            )
+    return LRUCacheBackend(
+        max_keys=settings.todo_cache_size,
+        ttl_seconds=ttl,
+        enabled=enabled,
+        max_fields=settings.todo_cache_fields_per_owner,
+    )
+
+
+todo_cache = build_todo_cache()
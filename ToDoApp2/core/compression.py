@@ -0,0 +1,194 @@
+"""
+Response compression as a pure ASGI middleware: zstd (when the zstandard
+package is installed) or gzip, negotiated from Accept-Encoding.
+
+Whole bodies are compressed in one go; streamed bodies are compressed chunk
+by chunk and flushed after each one, so a streamed page still reaches the
+client as it is produced.
+"""
+import gzip
+import logging
+import zlib
+from typing import Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .static import accepted_encodings
+
+try:
+    import zstandard  # optional: gzip only without it
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Preferred first
+SUPPORTED_ENCODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+class _Compressor:
+    """Incremental compressor: compress() returns bytes ready to send."""
+
+    def __init__(self, encoding: str, level: int):
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+            self._sync = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._sync = zlib.Z_SYNC_FLUSH
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        out = self._obj.compress(data)
+        return out + self._obj.flush(self._sync) if flush else out
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.compress(data) + self._obj.flush()
+
+
+def compress_body(encoding: str, level: int, body: bytes) -> bytes:
+    """One-shot compression of a whole body (zstd frames then carry the size)."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def negotiate(scope: Scope, encodings: Sequence[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """The first of `encodings` the client accepts, or None."""
+    accepted = accepted_encodings(scope)
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress responses for clients that accept zstd or gzip.
+
+    Skipped for excluded path prefixes and content types, HEAD requests,
+    responses that already have a Content-Encoding, partial content, and
+    whole bodies under `minimum_size`. Compressed responses get
+    `Vary: Accept-Encoding`, and strong ETags are weakened since the bytes
+    no longer match the uncompressed representation.
+
+    Args:
+        app: The wrapped application
+        minimum_size: Smallest unstreamed body worth compressing, in bytes
+        gzip_level: zlib level, 1-9
+        zstd_level: zstandard level, 1-22
+        exclude_paths: Path prefixes left alone (e.g. precompressed /static)
+        exclude_content_types: Content-Type prefixes left alone
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        exclude_paths: Sequence[str] = (),
+        exclude_content_types: Sequence[str] = (),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "zstd": zstd_level}
+        self.exclude_paths = tuple(exclude_paths)
+        self.exclude_content_types = tuple(t.lower() for t in exclude_content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD" or self._path_excluded(scope):
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def _path_excluded(self, scope: Scope) -> bool:
+        path = scope["path"]
+        return any(
+            path == prefix or path.startswith(prefix.rstrip("/") + "/")
+            for prefix in self.exclude_paths
+        )
+
+    def should_compress(self, headers: Headers, status: int) -> bool:
+        if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return not content_type.startswith(self.exclude_content_types) if content_type else True
+
+
+class _CompressionResponder:
+    """Wraps `send` for one response, deciding on the first body message."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            if self.start is not None:  # e.g. pathsend: let it through untouched
+                await self._send(self.start)
+                self.start = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = Headers(raw=start["headers"])
+            if not self.middleware.should_compress(headers, start["status"]) or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            level = self.middleware.levels[self.encoding]
+            if more_body:
+                self.compressor = _Compressor(self.encoding, level)
+                body = self.compressor.compress(body, flush=True)
+            else:
+                body = compress_body(self.encoding, level, body)
+            self._set_headers(start, None if more_body else len(body))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        if self.passthrough or self.compressor is None:
+            await self._send(message)
+            return
+        if more_body:
+            body = self.compressor.compress(body, flush=True)
+        else:
+            body = self.compressor.finish(body)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    def _set_headers(self, start: Message, content_length: Optional[int]) -> None:
+        headers = MutableHeaders(raw=start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        vary = headers.get("vary", "")
+        if "accept-encoding" not in vary.lower():
+            headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+
+__all__ = ["CompressionMiddleware", "SUPPORTED_ENCODINGS", "negotiate"]
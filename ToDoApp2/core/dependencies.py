@@ -7,6 +7,7 @@ from fastapi.security import OAuth2PasswordBearer
 from starlette import status
 from jose import JWTError
 from .security import decode_token
+from .token_cache import token_cache
 
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl='auth/token', auto_error=False)
@@ -19,7 +20,9 @@ async def get_current_user(
     """
     Get the current authenticated user from JWT token.
     
-    Checks both Authorization header and cookies for the token.
+    Checks both Authorization header and cookies for the token. Verified
+    payloads are cached until the token expires, so repeat requests skip
+    the signature check.
     
     Args:
         request: FastAPI request object
@@ -42,7 +45,10 @@ async def get_current_user(
                 detail='Could not validate user'
             )
         
-        payload = decode_token(token)
+        payload = token_cache.get(token)
+        if payload is None:
+            payload = decode_token(token)
+            token_cache.put(token, payload)
         username: str = payload.get('sub')
         user_id: str = payload.get('id')
         user_role: str = payload.get('role')
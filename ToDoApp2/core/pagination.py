@@ -0,0 +1,68 @@
+"""
+Opaque keyset cursors for paginated list endpoints.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+from starlette import status
+
+
+def encode_cursor(created_at: datetime, object_id: Any) -> str:
+    """
+    Encode the (created_at, _id) position of the last item on a page.
+
+    Args:
+        created_at: Sort key of the last item
+        object_id: Tie-breaking id of the last item
+
+    Returns:
+        URL-safe opaque cursor string
+    """
+    raw = json.dumps({'c': created_at.isoformat(), 'i': str(object_id)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data['c']), ObjectId(data['i'])
+    except (binascii.Error, ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Invalid cursor'
+        )
+
+
+def keyset_filter(cursor: Optional[str], field: str = 'created_at') -> Dict:
+    """
+    Build the filter selecting items after `cursor` in (field desc, _id desc) order.
+
+    Args:
+        cursor: Cursor from a previous page, or None for the first page
+        field: Primary sort field
+
+    Returns:
+        Mongo filter fragment (empty for the first page)
+    """
+    if not cursor:
+        return {}
+    value, object_id = decode_cursor(cursor)
+    return {
+        '$or': [
+            {field: {'$lt': value}},
+            {field: value, '_id': {'$lt': object_id}},
+        ]
+    }
@@ -1,6 +1,11 @@
 """
 Security utilities for password hashing and JWT token management.
 """
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import timedelta, datetime, timezone
@@ -21,6 +26,111 @@ def hash_password(password: str) -> str:
     return bcrypt_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Password hashing queue is full')
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded worker pool instead of the event loop.
+
+    At most `max_workers` hashes run at once and at most `max_queue` more may
+    wait for a worker; beyond that calls fail fast with PasswordHasherBusy.
+    """
+
+    def __init__(
+        self,
+        executor: str = 'thread',
+        max_workers: int = 4,
+        max_queue: int = 64,
+        retry_after: int = 1
+    ):
+        self.executor_kind = executor
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._total_wait_seconds = 0.0
+        self._max_seconds = 0.0
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash on the worker pool."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the worker pool."""
+        return await self._run(hash_password, password)
+
+    async def _run(self, func: Callable, *args):
+        if self._pending >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            raise PasswordHasherBusy(self.retry_after)
+
+        if self._executor is None:
+            executor_class = ProcessPoolExecutor if self.executor_kind == 'process' else ThreadPoolExecutor
+            self._executor = executor_class(max_workers=self.max_workers)
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        self._pending += 1
+        queued_at = time.perf_counter()
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                self._in_flight += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self._executor, func, *args)
+                finally:
+                    self._in_flight -= 1
+                    finished = time.perf_counter()
+                    self._completed += 1
+                    self._total_wait_seconds += started - queued_at
+                    self._total_seconds += finished - queued_at
+                    self._max_seconds = max(self._max_seconds, finished - queued_at)
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> Dict:
+        """Queue depth and latency counters for monitoring."""
+        completed = self._completed or 1
+        return {
+            'executor': self.executor_kind,
+            'max_workers': self.max_workers,
+            'in_flight': self._in_flight,
+            'queue_depth': self._pending - self._in_flight,
+            'completed': self._completed,
+            'rejected': self._rejected,
+            'avg_wait_ms': round(self._total_wait_seconds / completed * 1000, 2),
+            'avg_latency_ms': round(self._total_seconds / completed * 1000, 2),
+            'max_latency_ms': round(self._max_seconds * 1000, 2),
+        }
+
+    def shutdown(self):
+        """Stop the worker pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._semaphore = None
+
+
+password_hasher = PasswordHasher(
+    executor=settings.password_hash_executor,
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+    retry_after=settings.password_hash_retry_after_seconds
+)
+
+
 def create_access_token(username: str, user_id: str, role: str, expires_delta: timedelta = None) -> str:
     """
     Create a JWT access token.
@@ -0,0 +1,141 @@
+"""
+Static file serving for the fingerprinted build in static/dist (see
+tools/assets.py): manifest lookups for templates, and a StaticFiles that
+serves the precompressed .br/.gz siblings with long-lived cache headers.
+"""
+import json
+import logging
+import mimetypes
+import os
+import re
+import stat
+from pathlib import Path
+from typing import Dict, Optional
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Scope
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+DIST_DIRNAME = "dist"
+MANIFEST_PATH = STATIC_DIR / DIST_DIRNAME / "manifest.json"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Preferred first; only the encodings the build writes.
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{10}\.[^./]+$")
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Dict[str, str]:
+    """Original path -> hashed path, or {} when the assets were not built."""
+    if not settings.static_fingerprint:
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        logger.info("No static manifest at %s; serving unhashed assets", path)
+    except ValueError as exc:
+        logger.warning("Ignoring unreadable static manifest %s: %s", path, exc)
+    return {}
+
+
+manifest = load_manifest()
+
+
+def static_path(path: str) -> str:
+    """
+    Map a path under static/ to its fingerprinted build, e.g.
+    /css/base.css -> /dist/css/base.<hash>.css. Unknown paths pass through.
+    """
+    hashed = manifest.get(path.lstrip("/"))
+    return f"/{DIST_DIRNAME}/{hashed}" if hashed else path
+
+
+def accepted_encodings(scope: Scope) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}."""
+    accepted: Dict[str, float] = {}
+    for part in Headers(scope=scope).get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that prefers a precompressed sibling (`name.br`, `name.gz`)
+    when the client accepts it, and marks fingerprinted files immutable.
+    Anything else is revalidated through the ETag/Last-Modified StaticFiles
+    already sends.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] in ("GET", "HEAD"):
+            response = await self._precompressed_response(path, scope)
+            if response is not None:
+                return response
+        return await super().get_response(path, scope)
+
+    async def _precompressed_response(self, path: str, scope: Scope) -> Optional[Response]:
+        accepted = accepted_encodings(scope)
+        if not accepted:
+            return None
+        for encoding, suffix in PRECOMPRESSED:
+            if accepted.get(encoding, accepted.get("*", 0.0)) <= 0:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                continue
+            response = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                # Content-Type of the original file, not of the .br/.gz
+                media_type=mimetypes.guess_type(path)[0] or "text/plain",
+                headers={"Content-Encoding": encoding},
+            )
+            return self._finish(path, response, scope)
+        return None
+
+    def file_response(
+        self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200
+    ) -> Response:
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        return self._finish(os.path.relpath(full_path, self.directory), response, scope)
+
+    def _finish(self, path: str, response: FileResponse, scope: Scope) -> Response:
+        response.headers["Cache-Control"] = IMMUTABLE if self.is_fingerprinted(path) else REVALIDATE
+        response.headers["Vary"] = "Accept-Encoding"
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            # Starlette's NotModifiedResponse drops Vary, which caches need.
+            return Response(
+                status_code=304,
+                headers={
+                    name: value
+                    for name, value in response.headers.items()
+                    if name in ("cache-control", "etag", "expires", "vary", "content-location", "date")
+                },
+            )
+        return response
+
+    @staticmethod
+    def is_fingerprinted(path: str) -> bool:
+        parts = Path(path).parts
+        return bool(parts) and parts[0] == DIST_DIRNAME and bool(_HASHED_NAME.search(path))
+
+
+__all__ = ["PrecompressedStaticFiles", "load_manifest", "manifest", "static_path"]
@@ -0,0 +1,134 @@
+"""
+Shared Jinja environment: one per process, precompiled at startup, with a
+filesystem bytecode cache and a cache of rendered todo rows.
+"""
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, pass_context
+from markupsafe import Markup
+
+from ..config import settings
+from .static import static_path
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+def _bytecode_cache(pattern: str = '__jinja2_%s.cache') -> FileSystemBytecodeCache:
+    directory = None
+    if settings.template_bytecode_cache_dir:
+        path = Path(settings.template_bytecode_cache_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        directory = str(path)
+    # Without a directory Jinja uses a private directory under the system temp dir.
+    return FileSystemBytecodeCache(directory, pattern)
+
+
+class RowFragmentCache:
+    """
+    LRU cache of rendered todo-row.html fragments.
+
+    A row depends only on the todo and its position in the list, so the key
+    is (todo id, version, index); any write bumps the version, which retires
+    the old fragment.
+    """
+
+    template_name = 'todo-row.html'
+
+    def __init__(self, env: Environment, max_size: int = 5000):
+        self.env = env
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Tuple[str, int, int], Markup]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, todo: Dict[str, Any], index: int) -> Markup:
+        key = (str(todo.get('_id')), todo.get('version') or 0, index)
+        fragment = self._entries.get(key)
+        if fragment is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+        self.misses += 1
+        fragment = Markup(self.env.get_template(self.template_name).render(todo=todo, index=index))
+        if self.max_size > 0:
+            self._entries[key] = fragment
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return fragment
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+@pass_context
+def url_for(context: Dict[str, Any], name: str, **path_params: Any) -> Any:
+    """Starlette's url_for, with static paths mapped to their fingerprinted build."""
+    if name == 'static' and 'path' in path_params:
+        path_params['path'] = static_path(path_params['path'])
+    return context['request'].url_for(name, **path_params)
+
+
+def precompile_templates() -> int:
+    """
+    Compile every template into the environment's cache (and the bytecode
+    cache on disk) so the first request does not pay for it.
+
+    Returns:
+        Number of templates compiled
+    """
+    started = time.perf_counter()
+    names = env.list_templates(extensions=['html'])
+    for name in names:
+        env.get_template(name)
+        async_env.get_template(name)
+    logger.info(
+        "Precompiled %s templates in %.1fms", len(names), (time.perf_counter() - started) * 1000
+    )
+    return len(names)
+
+
+env = Environment(
+    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+    autoescape=True,
+    bytecode_cache=_bytecode_cache(),
+    # Outside debug templates do not change at runtime, so skip the mtime
+    # check per render.
+    auto_reload=(
+        settings.debug if settings.template_auto_reload is None else settings.template_auto_reload
+    ),
+)
+row_cache = RowFragmentCache(
+    env, max_size=settings.template_row_cache_size if settings.template_row_cache_enabled else 0
+)
+env.globals['render_row'] = row_cache.render
+# Set before Jinja2Templates, which only adds its own url_for if none exists.
+env.globals['url_for'] = url_for
+
+templates = Jinja2Templates(env=env)
+
+# Same loader and globals, compiled for generate_async (streamed pages). Async
+# code differs from sync code, so it gets its own bytecode files.
+async_env = env.overlay(
+    enable_async=True, bytecode_cache=_bytecode_cache('__jinja2_async_%s.cache')
+)
+
+
+__all__ = ["async_env", "env", "precompile_templates", "row_cache", "templates"]
@@ -0,0 +1,99 @@
+"""
+Bounded LRU cache of verified JWT payloads.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from ..config import settings
+
+
+class TokenCache:
+    """
+    Remembers tokens that already passed signature verification.
+
+    Entries are keyed by a SHA-256 digest of the token (the raw token is never
+    stored), expire at the token's `exp` claim and are evicted least recently
+    used once `max_size` is reached.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """Return the cached payload for a token, or None on a miss."""
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: Dict) -> None:
+        """Cache a verified payload until its `exp` claim."""
+        expires_at = payload.get('exp')
+        if self.max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        key = self._digest(token)
+        self._entries[key] = (float(expires_at), payload)
+        self._entries.move_to_end(key)
+        user_id = payload.get('id')
+        if user_id is not None:
+            self._by_user.setdefault(str(user_id), set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, token: str) -> None:
+        """Drop a single token, e.g. on logout."""
+        self._remove(self._digest(token))
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached token of a user, e.g. on password change."""
+        for key in list(self._by_user.get(str(user_id), ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1].get('id')
+        keys = self._by_user.get(str(user_id))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[str(user_id)]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache(
+    max_size=settings.token_cache_size if settings.token_cache_enabled else 0
+)
@@ -1,37 +1,84 @@
 """
 Database initialization and connection management for MongoDB with Beanie ODM.
 """
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import logging
+import time
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 from beanie import init_beanie
-from .models_beanie import User, Todo
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from .models_beanie import User, Todo, Session, OutboxMessage, UserStats, TodoHistory, JobLease, DECLARED_INDEXES
 from .config import settings
-import logging
 
 logger = logging.getLogger(__name__)
 
+INDEX_MODES = ("sync", "verify", "off")
+INDEX_PROGRESS_INTERVAL_SECONDS = 5
+
+DOCUMENT_MODELS = [User, Todo, Session, OutboxMessage, UserStats, TodoHistory, JobLease]
+
 
 class Database:
     """Database connection manager."""
-    
+
     client: AsyncIOMotorClient = None
-    
+
     @classmethod
     async def connect_db(cls):
         """Initialize database connection and Beanie ODM."""
         try:
             cls.client = AsyncIOMotorClient(settings.mongodb_url)
             database = cls.client[settings.mongodb_db_name]
-            
+
             await init_beanie(
                 database=database,
-                document_models=[User, Todo]
+                document_models=DOCUMENT_MODELS
             )
-            
+
             logger.info(f"Connected to MongoDB at {settings.mongodb_url}")
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
-    
+
+        await cls.sync_indexes(settings.mongodb_index_mode)
+
+    @classmethod
+    async def sync_indexes(cls, mode: str = "sync"):
+        """
+        Sync the indexes declared in models_beanie.DECLARED_INDEXES.
+
+        Args:
+            mode: "sync" builds missing indexes, "verify" only reports
+                missing or mismatched ones (fast restarts), "off" skips.
+        """
+        if mode not in INDEX_MODES:
+            logger.warning("Unknown index mode '%s'; falling back to 'verify'.", mode)
+            mode = "verify"
+        if mode == "off":
+            logger.info("Index sync disabled")
+            return
+
+        for model, indexes in DECLARED_INDEXES.items():
+            collection = model.get_motor_collection()
+            existing = await collection.index_information()
+            for index in indexes:
+                name = index.document["name"]
+                state = _index_state(index, existing)
+                if state == "ok":
+                    logger.debug("Index %s.%s present", collection.name, name)
+                    continue
+                if mode == "verify":
+                    logger.warning(
+                        "Index %s.%s is %s; run with MONGODB_INDEX_MODE=sync to build it",
+                        collection.name, name, state,
+                    )
+                    continue
+                await _build_index(collection, index)
+
     @classmethod
     async def close_db(cls):
         """Close database connection."""
@@ -39,6 +86,64 @@ class Database:
             cls.client.close()
             logger.info("Closed MongoDB connection")
 
+
+def _index_state(index: IndexModel, existing: Dict[str, dict]) -> str:
+    """Compare a declared index against collection.index_information()."""
+    spec = index.document
+    current = existing.get(spec["name"])
+    if current is None:
+        return "missing"
+    if list(current["key"]) != list(spec["key"].items()):
+        return "mismatched"
+    if bool(current.get("unique")) != bool(spec.get("unique")):
+        return "mismatched"
+    if current.get("expireAfterSeconds") != spec.get("expireAfterSeconds"):
+        return "mismatched"
+    return "ok"
+
+
+async def _build_index(collection: AsyncIOMotorCollection, index: IndexModel) -> None:
+    """Build one index, logging server-side progress while it runs."""
+    name = index.document["name"]
+    logger.info("Building index %s.%s", collection.name, name)
+    started = time.monotonic()
+    reporter = asyncio.create_task(_report_index_progress(collection, name))
+    try:
+        await collection.create_indexes([index])
+    except OperationFailure as exc:
+        # A conflicting definition or duplicate data must not take the app down.
+        logger.error("Failed to build index %s.%s: %s", collection.name, name, exc)
+        return
+    finally:
+        reporter.cancel()
+    logger.info(
+        "Built index %s.%s in %.2fs", collection.name, name, time.monotonic() - started
+    )
+
+
+async def _report_index_progress(collection: AsyncIOMotorCollection, name: str) -> None:
+    """Periodically log createIndexes progress reported by $currentOp."""
+    admin = collection.database.client.admin
+    pipeline: List[dict] = [
+        {"$currentOp": {"allUsers": True}},
+        {"$match": {"command.createIndexes": collection.name}},
+    ]
+    while True:
+        await asyncio.sleep(INDEX_PROGRESS_INTERVAL_SECONDS)
+        try:
+            async for op in admin.aggregate(pipeline):
+                progress = op.get("progress") or {}
+                if progress.get("total"):
+                    logger.info(
+                        "Index %s.%s: %s/%s (%s)",
+                        collection.name, name, progress.get("done"),
+                        progress["total"], op.get("msg", "building"),
+                    )
+        except OperationFailure as exc:
+            logger.debug("Index progress unavailable: %s", exc)
+            return
+
+
 async def init_db():
     """Initialize database connection."""
     await Database.connect_db()
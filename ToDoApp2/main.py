@@ -3,6 +3,7 @@ FastAPI Todo Application - Main Entry Point
 """
 import logging
 import os
+from datetime import datetime
 from typing import Optional
 from zoneinfo import ZoneInfo
 from contextlib import asynccontextmanager
@@ -11,14 +12,25 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler  # type: ignore
 from apscheduler.triggers.cron import CronTrigger  # type: ignore
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, RedirectResponse
 
 from .config import settings
+from .core.cache import todo_cache
+from .core.compression import CompressionMiddleware
 from .core.logging_config import setup_logging
+from .core.security import PasswordHasherBusy, password_hasher
+from .core.static import PrecompressedStaticFiles
+from .core.templating import precompile_templates
 from .database import close_db, init_db
 from .routers import admin, auth, todos, users
-from .services.notifications import send_daily_summaries_and_reset
+from .services.leases import exclusive
+from .services.notifications import (
+    backfill_next_resets,
+    reset_due_users,
+    send_daily_summaries_and_reset,
+)
+from .services.outbox import outbox_worker
+from .services.stats import reconcile_stats
 
 # Setup logging
 setup_logging()
@@ -34,20 +46,56 @@ except Exception:  # pragma: no cover - fallback path
 
 scheduler: Optional[AsyncIOScheduler] = None
 
-def _schedule_daily_reset() -> None:
+def _get_scheduler() -> AsyncIOScheduler:
     global scheduler
     if scheduler is None:
         scheduler = AsyncIOScheduler(timezone=APP_TIMEZONE)
+    return scheduler
+
+def _schedule_daily_reset() -> None:
+    scheduler = _get_scheduler()
+
+    # Every worker schedules the job; a lease makes sure only one of them runs it.
+    if settings.reset_mode == "global":
+        scheduler.add_job(
+            exclusive(
+                "daily-summary",
+                send_daily_summaries_and_reset,
+                run_key=lambda: datetime.now(APP_TIMEZONE).date().isoformat(),
+            ),
+            CronTrigger(hour=23, minute=59, timezone=APP_TIMEZONE),
+            id="daily-summary",
+            replace_existing=True,
+        )
+        logger.info("Daily summary + purge scheduled for 23:59 (%s)", APP_TIMEZONE)
+    else:
+        scheduler.add_job(
+            # One lease for the job, not per firing: a run that outlasts the
+            # interval keeps it, so no second process picks up the same users.
+            exclusive("user-resets", reset_due_users, repeating=True),
+            CronTrigger(minute=f"*/{settings.reset_check_minutes}", timezone=APP_TIMEZONE),
+            id="user-resets",
+            replace_existing=True,
+        )
+        logger.info(
+            "Per-user summary + purge checked every %s minutes", settings.reset_check_minutes
+        )
+        if settings.purge_mode == "swap":
+            logger.warning("PURGE_MODE=swap only applies to RESET_MODE=global; per-user resets purge in batches.")
+    scheduler.start()
 
-    trigger = CronTrigger(hour=23, minute=59, timezone=APP_TIMEZONE)
-    scheduler.add_job(
-        send_daily_summaries_and_reset,
-        trigger,
-        id="daily-summary",
+def _schedule_stats_reconcile() -> None:
+    _get_scheduler().add_job(
+        exclusive(
+            "stats-reconcile",
+            reconcile_stats,
+            run_key=lambda: datetime.now(APP_TIMEZONE).date().isoformat(),
+        ),
+        CronTrigger(hour=settings.stats_reconcile_hour, minute=0, timezone=APP_TIMEZONE),
+        id="stats-reconcile",
         replace_existing=True,
     )
-    scheduler.start()
-    logger.info("Daily summary + purge scheduled for 23:59 (%s)", APP_TIMEZONE)
+    logger.info("User stats reconciliation scheduled for %02d:00 (%s)", settings.stats_reconcile_hour, APP_TIMEZONE)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -84,12 +132,23 @@ async def lifespan(app: FastAPI):
     logger.info(f"DEBUG: MONGODB_URL env var is set: {'MONGODB_URL' in os.environ}")
     
     await init_db()
+    precompile_templates()
     
     if settings.daily_reset_enabled:
+        if settings.reset_mode != "global":
+            await backfill_next_resets()
         _schedule_daily_reset()
         if scheduler and not scheduler.running:
             scheduler.start()
             logger.info("Scheduler started")
+
+    if settings.stats_reconcile_enabled:
+        _schedule_stats_reconcile()
+        if not scheduler.running:
+            scheduler.start()
+
+    if settings.summary_email_enabled:
+        outbox_worker.start()
     
     logger.info("Application started successfully")
     
@@ -100,6 +159,10 @@ async def lifespan(app: FastAPI):
     if scheduler and scheduler.running:
         scheduler.shutdown(wait=False)
         logger.info("Scheduler shutdown")
+    if outbox_worker.running:
+        await outbox_worker.stop()
+    password_hasher.shutdown()
+    await todo_cache.close()
     await close_db()
     logger.info("Application shutdown complete")
 
@@ -122,6 +185,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        zstd_level=settings.compression_zstd_level,
+        exclude_paths=settings.compression_exclude_paths,
+        exclude_content_types=settings.compression_exclude_content_types,
+    )
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Shed load when the password hashing queue is full."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'detail': 'Server busy, please retry'},
+        headers={'Retry-After': str(exc.retry_after)}
+    )
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(todos.router)
@@ -129,7 +212,7 @@ app.include_router(admin.router)
 app.include_router(users.router)
 
 # Mount static files
-app.mount("/static", StaticFiles(directory="ToDoApp2/static"), name='static')
+app.mount("/static", PrecompressedStaticFiles(directory="ToDoApp2/static"), name='static')
 
 # --- Endpoints ---
 
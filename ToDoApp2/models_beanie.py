@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from beanie import Document, PydanticObjectId
-from pydantic import EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class User(Document):
     email: EmailStr
@@ -11,6 +12,10 @@ class User(Document):
     hashed_password: str
     is_active: bool = True
     role: str
+    # IANA zone the user's day ends in; None means settings.timezone.
+    timezone: Optional[str] = None
+    # UTC instant of the user's next local midnight, when their todos reset.
+    next_reset_at: Optional[datetime] = None
 
     class Settings:
         name = "users"
@@ -23,6 +28,145 @@ class Todo(Document):
     owner_id: Optional[str]
     created_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
+    # Bumped on every write; used for conditional (If-Match) updates.
+    version: int = 0
 
     class Settings:
-        name = "todos2" 
\ No newline at end of file
+        name = "todos2"
+
+
+class Session(Document):
+    """Server-side refresh token session; only a digest of the token is stored."""
+    token_hash: str
+    user_id: str
+    username: str
+    role: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+    last_used_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+
+    class Settings:
+        name = "sessions"
+
+
+class OutboxMessage(Document):
+    """An email waiting for, or done with, delivery by the outbox worker."""
+    recipient: str
+    subject: str
+    body: str
+    status: str = "pending"  # pending | sending | sent | failed
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    locked_until: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+
+    class Settings:
+        name = "email_outbox"
+
+
+class UserStats(Document):
+    """Per-user todo counters, kept current with $inc on every todo write."""
+    id: str  # the owner_id
+    total: int = 0
+    completed: int = 0
+    # Bumped on every write to the user's todos; the list endpoints' ETag.
+    list_version: int = 0
+    # Last rebuild from the todos; None until the counters have been rebuilt once.
+    reconciled_at: Optional[datetime] = None
+
+    class Settings:
+        name = "user_stats"
+
+
+class ArchivedTodo(BaseModel):
+    """A todo as embedded in a TodoHistory bucket."""
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    description: str
+    priority: int
+    complete: bool = False
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class TodoHistory(Document):
+    """One user's todos for one local day, archived by the nightly reset."""
+    owner_id: str
+    day: datetime  # the local date, stored as midnight
+    todos: List[ArchivedTodo] = Field(default_factory=list)
+    total: int = 0
+    completed: int = 0
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "todo_history"
+
+
+class JobLease(Document):
+    """Lease giving one process the right to run one scheduled job run."""
+    id: str  # "<job name>:<run key>"
+    owner: str
+    status: str = "running"  # running | done | failed
+    acquired_at: datetime = Field(default_factory=datetime.utcnow)
+    heartbeat_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+    class Settings:
+        name = "job_leases"
+
+
+# Declared indexes, synced by Database.connect_db (see settings.mongodb_index_mode).
+# Unique username/email also serve the $or duplicate check in auth.create_user.
+# next_reset_at serves the per-user reset job's "whose day just ended" query.
+USER_INDEXES = [
+    IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    IndexModel([("next_reset_at", ASCENDING)], name="next_reset_at"),
+]
+
+# Serves the per-user list queries: find(owner_id).sort(-created_at, -_id),
+# including the keyset pagination cursor on (created_at, _id).
+TODO_INDEXES = [
+    IndexModel(
+        [("owner_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+        name="owner_created_id_desc",
+    ),
+]
+
+# Refresh lookups hit token_hash; the TTL index lets Mongo drop expired sessions.
+SESSION_INDEXES = [
+    IndexModel([("token_hash", ASCENDING)], name="token_hash_unique", unique=True),
+    IndexModel([("user_id", ASCENDING)], name="user_id"),
+    IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+]
+
+# Claim queries: due pending messages, and sending messages whose lock expired.
+# Delivered messages are kept for a week, then dropped by the TTL index.
+OUTBOX_INDEXES = [
+    IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt"),
+    IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)], name="status_locked_until"),
+    IndexModel([("sent_at", ASCENDING)], name="sent_at_ttl", expireAfterSeconds=7 * 24 * 3600),
+]
+
+# One bucket per user per day: the target of the archive $merge (which needs a
+# unique index on its "on" fields) and the history endpoint's newest-first scan.
+HISTORY_INDEXES = [
+    IndexModel([("owner_id", ASCENDING), ("day", DESCENDING)], name="owner_day_unique", unique=True),
+]
+
+# Expired leases (dead holders, old finished runs) are dropped by TTL.
+JOB_LEASE_INDEXES = [
+    IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+]
+
+DECLARED_INDEXES = {
+    User: USER_INDEXES,
+    Todo: TODO_INDEXES,
+    Session: SESSION_INDEXES,
+    OutboxMessage: OUTBOX_INDEXES,
+    TodoHistory: HISTORY_INDEXES,
+    JobLease: JOB_LEASE_INDEXES,
+}
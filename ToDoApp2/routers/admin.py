@@ -1,12 +1,25 @@
 """
 Admin router for administrative operations.
 """
-from typing import Annotated, Dict
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from datetime import datetime
+from typing import Annotated, Any, AsyncIterator, Dict, Literal, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from starlette import status
 
+from ..config import settings
 from ..models_beanie import Todo
+from ..core.cache import todo_cache
 from ..core.dependencies import require_admin
+from ..core.security import password_hasher
+from ..core.templating import row_cache
+from ..core.token_cache import token_cache
+from ..services import stats as stats_service
+from ..services.outbox import outbox_counts, outbox_worker
 
 
 router = APIRouter(
@@ -16,22 +29,96 @@ router = APIRouter(
 
 AdminDependency = Annotated[Dict, Depends(require_admin)]
 
+EXPORT_MEDIA_TYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+async def _export_todos(fmt: str, batch_size: int) -> AsyncIterator[str]:
+    """
+    Stream every todo straight from a Motor cursor, one batch at a time.
+
+    Only one batch of raw documents is held in memory, so worker memory
+    stays flat regardless of collection size.
+    """
+    cursor = Todo.get_motor_collection().find({}, batch_size=batch_size)
+    first = True
+    if fmt == 'json':
+        yield '['
+    while True:
+        batch = await cursor.to_list(length=batch_size)
+        if not batch:
+            break
+        rows = [json.dumps(doc, default=_json_default) for doc in batch]
+        if fmt == 'ndjson':
+            yield '\n'.join(rows) + '\n'
+        else:
+            yield ('' if first else ',') + ','.join(rows)
+        first = False
+    if fmt == 'json':
+        yield ']'
+
 
 @router.get('/todo', status_code=status.HTTP_200_OK)
-async def get_all_todos(admin: AdminDependency):
-    """Get all todos (admin only)."""
-    return await Todo.find_all().to_list()
+async def get_all_todos(
+    admin: AdminDependency,
+    format: Literal['json', 'ndjson'] = Query('json'),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000)
+):
+    """
+    Get all todos (admin only).
+
+    Streams either a chunked JSON array (`format=json`, the default) or
+    newline-delimited JSON (`format=ndjson`).
+    """
+    return StreamingResponse(
+        _export_todos(format, batch_size or settings.admin_export_batch_size),
+        media_type=EXPORT_MEDIA_TYPES[format]
+    )
+
+
+@router.get('/metrics', status_code=status.HTTP_200_OK)
+async def get_metrics(admin: AdminDependency):
+    """Runtime counters for in-process components (admin only)."""
+    return {
+        'password_hasher': password_hasher.stats(),
+        'token_cache': token_cache.stats(),
+        'todo_cache': todo_cache.stats(),
+        'template_row_cache': row_cache.stats(),
+        'outbox': {**outbox_worker.stats(), 'messages': await outbox_counts()},
+    }
 
 
 @router.delete('/todo/{todo_id}', status_code=status.HTTP_204_NO_CONTENT)
 async def delete_todo(admin: AdminDependency, todo_id: str):
     """Delete any todo (admin only)."""
-    todo_model = await Todo.get(todo_id)
-    
-    if todo_model is None:
+    try:
+        object_id = ObjectId(todo_id)
+    except InvalidId:
+        object_id = None
+
+    deleted = None
+    if object_id is not None:
+        deleted = await Todo.get_motor_collection().find_one_and_delete(
+            {'_id': object_id}, projection={'owner_id': 1, 'complete': 1}
+        )
+
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Todo not found'
         )
-    
-    await todo_model.delete()
\ No newline at end of file
+    if deleted.get('owner_id'):
+        await stats_service.apply_delta(
+            deleted['owner_id'], total=-1, completed=-int(bool(deleted.get('complete')))
+        )
+
@@ -1,35 +1,27 @@
-from fastapi import APIRouter,Depends, HTTPException, Request
+from fastapi import APIRouter,Depends, HTTPException, Request, Response
 from pydantic import BaseModel
-from ..models_beanie import User
 from ..config import settings
-from passlib.context import CryptContext 
+from ..models_beanie import User
+from ..core.dependencies import oauth2_bearer
+from ..core.security import password_hasher
+from ..core.templating import templates
+from ..core.token_cache import token_cache
+from ..schemas.auth import Token
+from ..services.auth import (
+    authenticate_user, create_session, issue_access_token, refresh_session, revoke_session
+)
+from ..services.notifications import is_valid_timezone, next_reset_at, user_timezone
 from typing import Annotated, Optional
 from starlette import status
-from fastapi.security import OAuth2PasswordRequestForm,OAuth2PasswordBearer
-from jose import JWTError, jwt
-from datetime import timedelta,datetime,timezone
-from fastapi.templating import Jinja2Templates
-from beanie import PydanticObjectId
+from fastapi.security import OAuth2PasswordRequestForm
 from starlette.responses import RedirectResponse, JSONResponse
-from beanie.operators import Or
+from pymongo.errors import DuplicateKeyError
 
 router=APIRouter(
        prefix='/auth',
        tags=['auth'] 
 )
 
-SECRET_KEY=settings.secret_key
-ALGORITHM=settings.algorithm
-
-bcrypt_context=CryptContext(schemes=['bcrypt'],deprecated='auto')
-oauth2_bearer=OAuth2PasswordBearer(tokenUrl='auth/token', auto_error=False)
-
-class Token(BaseModel):
-    access_token:str
-    token_type:str
-
-templates = Jinja2Templates(directory="ToDoApp2/templates")
-
 # pages
 @router.get('/login-page')
 def render_login_page(request:Request):
@@ -40,39 +32,6 @@ def render_register_page(request:Request):
     return templates.TemplateResponse('register.html',{'request':request})
 #endpoints
 
-def authenticate_user(username:str,password:str):
-    user: User|None = None
-    # lookup by username
-    user = User.find_one({"username": username}).run_sync()
-    if not user:
-        return False
-    if not bcrypt_context.verify(password,user.hashed_password):
-        return False
-    return user
-
-def create_access_token(username:str,user_id:str,role:str,expires_delta:timedelta):
-    encode={'sub':username,'id':user_id,'role':role}
-    expires=datetime.now(timezone.utc)+ expires_delta
-    encode.update({'exp':expires})
-    return jwt.encode(encode,SECRET_KEY,algorithm=ALGORITHM)
-
-async def get_current_user(request: Request, token: Annotated[Optional[str],Depends(oauth2_bearer)]=None):
-    try:
-         # Fallback to cookie if no Authorization header token present
-         if not token:
-            token = request.cookies.get('access_token')
-         if not token:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail='could not validate user')
-         payload=jwt.decode(token,SECRET_KEY,algorithms=[ALGORITHM])
-         username:str=payload.get('sub')
-         user_id:str=payload.get('id')
-         user_role:str=payload.get('role')
-         if username is None or user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail='could not validate user')
-         return{'username':username,'id':user_id,'user_role':user_role}
-    except JWTError:
-         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail='could not validate user')
-         
 class CreateUserRequest(BaseModel):
     username:str
     email:str   
@@ -81,6 +40,12 @@ class CreateUserRequest(BaseModel):
     # phone_number:str
     password:str
     role:str
+    timezone:Optional[str]=None
+
+def _registration_error(request: Request, content_type: str, message: str="Username or email already exists"):
+    if 'application/json' in content_type:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+    return templates.TemplateResponse('register.html',{'request':request, 'error': message}, status_code=status.HTTP_400_BAD_REQUEST)
 
 @router.post('/',status_code=status.HTTP_201_CREATED)
 async def create_user(request: Request):
@@ -93,17 +58,19 @@ async def create_user(request: Request):
             firstname=form.get('firstname',''),
             lastname=form.get('lastname',''),
             password=form.get('password',''),
-            role=form.get('role','')
+            role=form.get('role',''),
+            timezone=form.get('timezone') or None
         )
     else:
         data = await request.json()
         payload = CreateUserRequest(**data)
 
+    if payload.timezone and not is_valid_timezone(payload.timezone):
+        return _registration_error(request, content_type, f"Unknown timezone '{payload.timezone}'")
+
     existing = await User.find_one({"$or": [{"username": payload.username}, {"email": payload.email}]})
     if existing:
-        if 'application/json' in content_type:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username or email already exists")
-        return templates.TemplateResponse('register.html',{'request':request, 'error': 'Username or email already exists'}, status_code=status.HTTP_400_BAD_REQUEST)
+        return _registration_error(request, content_type)
 
     create_user_model=User(
         email=payload.email,
@@ -112,27 +79,66 @@ async def create_user(request: Request):
         last_name=payload.lastname,
         # phone_number=payload.phone_number,
         role=payload.role,
-    hashed_password=bcrypt_context.hash(payload.password),      
-        is_active=True
+        hashed_password=await password_hasher.hash(payload.password),
+        is_active=True,
+        timezone=payload.timezone,
+        next_reset_at=next_reset_at(user_timezone(payload.timezone))
     )
-    await create_user_model.insert()
+    try:
+        await create_user_model.insert()
+    except DuplicateKeyError:
+        # Lost a race with a concurrent registration; the unique index caught it.
+        return _registration_error(request, content_type)
 
     if 'application/json' in content_type:
         return JSONResponse({"id": str(create_user_model.id), "username": create_user_model.username}, status_code=status.HTTP_201_CREATED)
     # HTML form: redirect to login page with a flash-like success message via query param
     return RedirectResponse(url='/auth/login-page', status_code=status.HTTP_302_FOUND)
 
+# The refresh token lives only in this cookie: HttpOnly so scripts cannot
+# read it, and scoped to /auth so only /auth/refresh and /auth/logout see it.
+REFRESH_COOKIE = 'refresh_token'
+REFRESH_COOKIE_PATH = '/auth'
+
+def _set_refresh_cookie(response: Response, refresh_token: str):
+    response.set_cookie(
+        key=REFRESH_COOKIE,
+        value=refresh_token,
+        max_age=settings.refresh_token_expire_days * 24 * 3600,
+        path=REFRESH_COOKIE_PATH,
+        httponly=True,
+        secure=settings.refresh_cookie_secure,
+        samesite='strict',
+    )
+
 @router.post('/token',response_model=Token)
-async def login_for_access_token(form_data:Annotated[OAuth2PasswordRequestForm, Depends()]):
-    user=await User.find_one({"username": form_data.username})
-    if not user or not bcrypt_context.verify(form_data.password,user.hashed_password):
+async def login_for_access_token(response: Response, form_data:Annotated[OAuth2PasswordRequestForm, Depends()]):
+    user=await authenticate_user(form_data.username,form_data.password)
+    if not user:
+         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail='could not validate user')
+    _set_refresh_cookie(response, await create_session(user))
+    return {'access_token':issue_access_token(user), 'token_type':'bearer'}
+
+@router.post('/refresh',response_model=Token)
+async def refresh_access_token(request: Request, response: Response):
+    refresh_token = request.cookies.get(REFRESH_COOKIE)
+    tokens = await refresh_session(refresh_token) if refresh_token else None
+    if not tokens:
          raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail='could not validate user')
-    token=create_access_token(user.username,str(user.id),user.role,timedelta(minutes=20))
-    return {'access_token':token, 'token_type':'bearer'}
+    access_token, refresh_token = tokens
+    _set_refresh_cookie(response, refresh_token)
+    return {'access_token':access_token, 'token_type':'bearer'}
 
 @router.post('/logout')
-async def logout():
+async def logout(request: Request, token: Annotated[Optional[str],Depends(oauth2_bearer)]=None):
+    token = token or request.cookies.get('access_token')
+    if token:
+        token_cache.invalidate(token)
+    refresh_token = request.cookies.get(REFRESH_COOKIE)
+    if refresh_token:
+        await revoke_session(refresh_token)
     response = RedirectResponse(url='/auth/login-page', status_code=status.HTTP_302_FOUND)
     response.delete_cookie(key='access_token', path='/')
+    response.delete_cookie(key=REFRESH_COOKIE, path=REFRESH_COOKIE_PATH)
     return response
 
@@ -2,19 +2,28 @@
 Todo management router for CRUD operations and page rendering.
 """
 from datetime import datetime
-from typing import Annotated, Dict
-from zoneinfo import ZoneInfo
+from typing import Annotated, Dict, List, Optional, Tuple
 
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Depends, HTTPException, Path, Request
-from fastapi.templating import Jinja2Templates
+from beanie.odm.utils.dump import get_dict
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, Response
+from pymongo import DeleteOne, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 from starlette import status
-from starlette.responses import RedirectResponse
+from starlette.responses import JSONResponse, RedirectResponse, StreamingResponse
 
 from ..config import settings
+from ..core.cache import todo_cache
 from ..core.dependencies import get_current_user
-from ..models_beanie import Todo
-from ..schemas.todo import TodoRequest
+from ..core.pagination import encode_cursor, keyset_filter
+from ..core.templating import async_env, templates
+from ..models_beanie import Todo, User
+from ..schemas.todo import TodoBatchRequest, TodoBatchResult, TodoPatch, TodoRequest
+from ..services import stats as stats_service
+from ..services.history import fetch_history_page
+from ..services.notifications import user_timezone
 
 
 router = APIRouter(
@@ -23,12 +32,9 @@ router = APIRouter(
 )
 
 UserDependency = Annotated[Dict, Depends(get_current_user)]
-templates = Jinja2Templates(directory="ToDoApp2/templates")
 
-try:
-    ROUTER_TIMEZONE = ZoneInfo(settings.timezone)
-except Exception:  # pragma: no cover - fallback path
-    ROUTER_TIMEZONE = ZoneInfo("UTC")
+# Streamed pages are sent in chunks of at least this many bytes.
+STREAM_FLUSH_BYTES = 4096
 
 
 def redirect_to_login():
@@ -41,8 +47,266 @@ def redirect_to_login():
     return redirect_response
 
 
-def _today_label() -> str:
-    return datetime.now(tz=ROUTER_TIMEZONE).strftime("%A, %d %B %Y")
+async def _today_label(owner_id: str) -> str:
+    """Today's date in the user's own zone."""
+    user = await User.get_motor_collection().find_one(
+        {'_id': PydanticObjectId(owner_id)}, {'timezone': 1}
+    )
+    tz = user_timezone((user or {}).get('timezone'))
+    return datetime.now(tz=tz).strftime("%A, %d %B %Y")
+
+
+def _page_limit(limit: Optional[int]) -> int:
+    if limit is None:
+        return settings.todo_page_size
+    return max(1, min(limit, settings.todo_page_size_max))
+
+
+async def _fetch_todo_page(
+    owner_id: str, cursor: Optional[str], limit: Optional[int]
+) -> Tuple[List[Todo], Optional[str]]:
+    """
+    Fetch one page of a user's todos, newest first.
+
+    Uses keyset pagination on (created_at, _id) so every page is a bounded
+    index range scan, regardless of how many todos the user has.
+
+    Returns:
+        The page of todos and the cursor for the next page (None on the last page)
+    """
+    limit = _page_limit(limit)
+    query = {'owner_id': owner_id, **keyset_filter(cursor)}
+    todos = await Todo.find(query).sort(
+        [('created_at', -1), ('_id', -1)]
+    ).limit(limit + 1).to_list()
+
+    next_cursor = None
+    if len(todos) > limit:
+        todos = todos[:limit]
+        last = todos[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return todos, next_cursor
+
+
+async def _cached_todo_page(
+    owner_id: str, cursor: Optional[str], limit: Optional[int], list_version: int
+) -> Dict:
+    """
+    A page of todos as JSON-ready dicts, served from the todo cache if possible.
+
+    The field includes the user's list version, so a page cached before any
+    write (in this or another process) is never served afterwards.
+
+    Returns:
+        Dict with `items` and `next_cursor`
+    """
+    field = f'{list_version}:{_page_limit(limit)}:{cursor or ""}'
+    page = await todo_cache.get(owner_id, field)
+    if page is None:
+        todos, next_cursor = await _fetch_todo_page(owner_id, cursor, limit)
+        page = {
+            'items': [todo.model_dump(mode='json', by_alias=True) for todo in todos],
+            'next_cursor': next_cursor,
+        }
+        await todo_cache.set(owner_id, field, page)
+    return page
+
+
+class _TodoStream:
+    """
+    One page of a user's todos read straight off a Motor cursor.
+
+    Iterating yields raw documents as the driver returns them; `count` and
+    `next_cursor` are final once iteration ends, which is when the streamed
+    template reaches the "load more" button.
+    """
+
+    def __init__(self, owner_id: str, limit: int):
+        self.owner_id = owner_id
+        self.limit = limit
+        self.count = 0
+        self.next_cursor: Optional[str] = None
+
+    async def __aiter__(self):
+        cursor = Todo.get_motor_collection().find({'owner_id': self.owner_id}).sort(
+            [('created_at', -1), ('_id', -1)]
+        ).limit(self.limit + 1).batch_size(min(self.limit + 1, 100))
+        last = None
+        async for doc in cursor:
+            if self.count == self.limit:
+                self.next_cursor = encode_cursor(last['created_at'], last['_id'])
+                break
+            self.count += 1
+            last = doc
+            yield doc
+
+
+async def _stream_template(name: str, context: Dict):
+    """Render a template with generate_async, flushing in STREAM_FLUSH_BYTES chunks."""
+    template = async_env.get_template(name)
+    buffer: List[str] = []
+    size = 0
+    async for chunk in template.generate_async(context):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= STREAM_FLUSH_BYTES:
+            yield ''.join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode()
+
+
+def _parse_object_id(todo_id: str) -> Optional[ObjectId]:
+    try:
+        return ObjectId(todo_id)
+    except (InvalidId, TypeError):
+        return None
+
+
+def _update_pipeline(fields: Dict, now: datetime, write_id: Optional[ObjectId] = None) -> List[Dict]:
+    """
+    Build an update pipeline that sets `fields` without reading the todo first.
+
+    When `complete` is among the fields, `completed_at` follows the same rules
+    as a full update: stamped when a todo becomes complete, kept while it stays
+    complete, and cleared when it is reopened. The todo's version is bumped.
+    A `write_id` is stored as `last_write_id` so a batch can tell afterwards
+    which of its updates were applied.
+    """
+    stage = {field: {'$literal': value} for field, value in fields.items()}
+    stage['version'] = {'$add': [{'$ifNull': ['$version', 0]}, 1]}
+    if write_id is not None:
+        stage['last_write_id'] = write_id
+    if 'complete' in fields:
+        if fields['complete']:
+            stage['completed_at'] = {
+                '$cond': [{'$eq': ['$complete', True]}, '$completed_at', {'$literal': now}]
+            }
+        else:
+            stage['completed_at'] = None
+    return [{'$set': stage}]
+
+
+def _apply_update(before: Dict, fields: Dict, now: datetime) -> Dict:
+    """The document `_update_pipeline(fields, now)` turns `before` into."""
+    after = {**before, **fields, 'version': (before.get('version') or 0) + 1}
+    if 'complete' in fields:
+        if fields['complete']:
+            after['completed_at'] = before.get('completed_at') if before.get('complete') is True else now
+        else:
+            after['completed_at'] = None
+    return after
+
+
+def _completed_delta(before: Dict, after: Dict) -> int:
+    return int(bool(after.get('complete'))) - int(bool(before.get('complete')))
+
+
+def _etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _list_etag(list_version: int) -> str:
+    # Not a todo version, so it can never satisfy an If-Match on a write.
+    return f'W/"list-{list_version}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith('W/') else tag) == opaque:
+            return True
+    return False
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+
+def _expected_version(
+    body_version: Optional[int], if_match: Optional[str]
+) -> Tuple[Optional[int], int]:
+    """
+    Resolve the version a conditional write expects to replace.
+
+    An `If-Match` header wins over a `version` in the body. A header mismatch
+    is reported as 412 and a body mismatch as 409.
+
+    Returns:
+        The expected version (None for an unconditional write) and the status
+        code to raise if it does not match
+    """
+    if if_match is not None and if_match.strip() != '*':
+        tag = if_match.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        try:
+            return int(tag.strip('"')), status.HTTP_412_PRECONDITION_FAILED
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail='Invalid If-Match header'
+            )
+    return body_version, status.HTTP_409_CONFLICT
+
+
+def _owner_filter(object_id: ObjectId, owner_id: str, version: Optional[int] = None) -> Dict:
+    query = {'_id': object_id, 'owner_id': owner_id}
+    if version == 0:
+        # Todos written before versioning have no version field yet.
+        query['version'] = {'$in': [0, None]}
+    elif version is not None:
+        query['version'] = version
+    return query
+
+
+async def _raise_write_miss(
+    object_id: ObjectId, owner_id: str, version: Optional[int], conflict_status: int
+):
+    """Explain why a filtered write matched nothing: a version conflict or a 404."""
+    if version is not None and await Todo.find_one(_owner_filter(object_id, owner_id)):
+        raise HTTPException(
+            status_code=conflict_status,
+            detail='Todo was modified by another request'
+        )
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail='Todo not found'
+    )
+
+
+async def _settle_batch_misses(
+    collection, writes: List[Tuple[ObjectId, TodoBatchResult]], write_id: ObjectId
+) -> None:
+    """
+    Correct the reported status of pinned batch writes after some missed.
+
+    bulk_write only reports totals, so each write is checked on its todo: an
+    update was applied if the todo still carries the batch's `write_id`, a
+    delete if the todo is gone. A todo that is gone was deleted either way, so
+    only a delete of a todo that still exists is reported as a conflict.
+    """
+    ids = [object_id for object_id, _ in writes]
+    cursor = collection.find({'_id': {'$in': ids}}, {'last_write_id': 1})
+    write_ids = {doc['_id']: doc.get('last_write_id') async for doc in cursor}
+
+    for object_id, result in writes:
+        if object_id not in write_ids:
+            if result.status != 'deleted':
+                result.status, result.detail = 'not_found', 'Todo not found'
+        elif result.status == 'deleted' or write_ids[object_id] != write_id:
+            result.status, result.detail = 'conflict', 'Todo was modified by another request'
+
+
+async def _todo_counts(owner_id: str) -> Dict[str, int]:
+    stats = await stats_service.get_stats(owner_id)
+    return {f'{name}_count': value for name, value in stats.items()}
 
 
 @router.get('/todo-page')
@@ -53,23 +317,64 @@ async def render_todo_page(request: Request):
         if user is None:
             return redirect_to_login()
 
-        todos = await Todo.find(
-            Todo.owner_id == user.get("id")
-        ).sort(-Todo.created_at).to_list()
-
+        owner_id = user.get("id")
+        counts = await _todo_counts(owner_id)
+        context = {
+            'request': request,
+            'offset': 0,
+            'user': user,
+            'today_date': await _today_label(owner_id),
+            **counts
+        }
+
+        if settings.stream_todo_page:
+            # The layout goes out before the first todo is read, and rows
+            # follow as the cursor returns them.
+            stream = _TodoStream(owner_id, settings.todo_page_size_max)
+            return StreamingResponse(
+                _stream_template('todo.html', {**context, 'todos': stream, 'page': stream}),
+                media_type='text/html'
+            )
+
+        list_version = await stats_service.get_list_version(owner_id)
+        page = await _cached_todo_page(owner_id, None, None, list_version)
         return templates.TemplateResponse(
             'todo.html',
             {
-                'request': request,
-                'todos': todos,
-                'user': user,
-                'today_date': _today_label()
+                **context,
+                'todos': page['items'],
+                'page': {'next_cursor': page['next_cursor'], 'count': len(page['items'])},
             }
         )
     except:
         return redirect_to_login()
 
 
+@router.get('/todo-page/rows')
+async def render_todo_rows(
+    request: Request,
+    cursor: str = Query(),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1)
+):
+    """Render the next page of todo rows for the "load more" button."""
+    try:
+        user = await get_current_user(request)
+    except HTTPException:
+        return redirect_to_login()
+
+    owner_id = user.get("id")
+    list_version = await stats_service.get_list_version(owner_id)
+    page = await _cached_todo_page(owner_id, cursor, limit, list_version)
+    response = templates.TemplateResponse(
+        'todo-rows.html',
+        {'request': request, 'todos': page['items'], 'offset': offset}
+    )
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+    return response
+
+
 @router.get('/add-todo-page')
 async def render_add_todo_page(request: Request):
     """Render the add todo page."""
@@ -113,30 +418,103 @@ async def render_edit_todo_page(request: Request, todo_id: str):
 # ============================================================================
 
 @router.get('/')
-async def read_all(user: UserDependency):
-    """Get all todos for the current user."""
+async def read_all(
+    user: UserDependency,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get a page of todos for the current user, newest first.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page;
+    it is null on the last page. The weak `ETag` changes whenever any of the
+    user's todos does; send it back in `If-None-Match` to get a 304 after
+    only a version lookup.
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed"
+        )
+    owner_id = user.get('id')
+    list_version = await stats_service.get_list_version(owner_id)
+    etag = _list_etag(list_version)
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    page = await _cached_todo_page(owner_id, cursor, limit, list_version)
+    return JSONResponse(page, headers={'ETag': etag})
+
+
+@router.get('/history')
+async def read_history(
+    user: UserDependency,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1)
+):
+    """
+    Get a page of the current user's archived days, newest first.
+
+    Each item holds one day's todos as archived by the nightly reset. Pass
+    the returned `next_cursor` back as `cursor` to fetch the next page.
+    """
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed"
         )
-    return await Todo.find(Todo.owner_id == user.get('id')).to_list()
+    buckets, next_cursor = await fetch_history_page(user.get('id'), cursor, _page_limit(limit))
+    return {'items': buckets, 'next_cursor': next_cursor}
+
+
+@router.get('/stats')
+async def read_stats(user: UserDependency):
+    """Get the current user's total, completed and pending todo counts."""
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed"
+        )
+    return await stats_service.get_stats(user.get('id'))
 
 
 @router.get("/todo/{todo_id}", status_code=status.HTTP_200_OK)
-async def read_todo(user: UserDependency, todo_id: str = Path()):
-    """Get a specific todo by ID."""
+async def read_todo(
+    user: UserDependency,
+    response: Response,
+    todo_id: str = Path(),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get a specific todo by ID.
+
+    The weak `ETag` carries the todo's version. If it still matches
+    `If-None-Match`, a 304 is returned after a version-only lookup.
+    """
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed"
         )
-    
-    todo_model = await Todo.get(PydanticObjectId(todo_id))
-    
-    if todo_model is not None and todo_model.owner_id == user.get('id'):
-        return todo_model
-    
+
+    object_id = _parse_object_id(todo_id)
+    if object_id is not None:
+        owner_id = user.get('id')
+        if if_none_match:
+            current = await Todo.get_motor_collection().find_one(
+                _owner_filter(object_id, owner_id), {'version': 1}
+            )
+            if current is not None:
+                etag = f"W/{_etag(current.get('version') or 0)}"
+                if _etag_matches(if_none_match, etag):
+                    return _not_modified(etag)
+
+        todo_model = await Todo.find_one(_owner_filter(object_id, owner_id))
+        if todo_model is not None:
+            response.headers['ETag'] = f"W/{_etag(todo_model.version)}"
+            return todo_model
+
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail='Todo not found'
@@ -152,59 +530,279 @@ async def create_todo(user: UserDependency, todo_request: TodoRequest):
             detail="Authentication failed"
         )
     
-    todo_model = Todo(**todo_request.model_dump(), owner_id=user.get('id'))
+    todo_model = Todo(**todo_request.model_dump(exclude={'version'}), owner_id=user.get('id'))
     if todo_request.complete:
         todo_model.completed_at = datetime.utcnow()
     await todo_model.insert()
+    await stats_service.apply_delta(todo_model.owner_id, total=1, completed=int(todo_model.complete))
     return todo_model
 
 
 @router.put('/todo/update_todo/{todo_id}', status_code=status.HTTP_204_NO_CONTENT)
-async def update_todo(user: UserDependency, todo_id: str, todo_request: TodoRequest):
-    """Update an existing todo."""
+async def update_todo(
+    user: UserDependency,
+    todo_id: str,
+    todo_request: TodoRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Update an existing todo in a single owner-scoped round-trip.
+
+    Send the todo's `version` in the body or an `If-Match` header to make the
+    write conditional. The new version is returned in the `ETag` header.
+    """
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed"
         )
-    
-    todo_model = await Todo.get(PydanticObjectId(todo_id))
-    
-    if todo_model is None or todo_model.owner_id != user.get('id'):
+
+    object_id = _parse_object_id(todo_id)
+    if object_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Todo not found'
         )
 
-    todo_model.title = todo_request.title
-    todo_model.description = todo_request.description
-    todo_model.priority = todo_request.priority
-    previously_complete = todo_model.complete
-    todo_model.complete = todo_request.complete
+    owner_id = user.get('id')
+    version, conflict_status = _expected_version(todo_request.version, if_match)
+    fields = todo_request.model_dump(exclude={'version'})
+    now = datetime.utcnow()
+    before = await Todo.get_motor_collection().find_one_and_update(
+        _owner_filter(object_id, owner_id, version),
+        _update_pipeline(fields, now),
+        projection={'version': 1, 'complete': 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        await _raise_write_miss(object_id, owner_id, version, conflict_status)
+
+    updated = _apply_update(before, fields, now)
+    await stats_service.apply_delta(owner_id, completed=_completed_delta(before, updated))
+    response.headers['ETag'] = _etag(updated['version'])
+
+
+@router.patch('/todo/{todo_id}', status_code=status.HTTP_200_OK)
+async def patch_todo(
+    user: UserDependency,
+    todo_id: str,
+    todo_patch: TodoPatch,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Partially update a todo (JSON Merge Patch) and return its new state.
+
+    Only the fields sent are written, so toggling `complete` sends and stores
+    just that field (plus `completed_at` and the version bump).
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed"
+        )
 
-    if todo_request.complete and not previously_complete:
-        todo_model.completed_at = datetime.utcnow()
-    elif not todo_request.complete:
-        todo_model.completed_at = None
+    object_id = _parse_object_id(todo_id)
+    if object_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Todo not found'
+        )
+
+    owner_id = user.get('id')
+    version, conflict_status = _expected_version(todo_patch.version, if_match)
+    query = _owner_filter(object_id, owner_id, version)
+    fields = todo_patch.model_dump(include=todo_patch.model_fields_set - {'version'})
+
+    if fields:
+        # Read the previous state in the same round-trip to adjust the counters.
+        now = datetime.utcnow()
+        before = await Todo.get_motor_collection().find_one_and_update(
+            query,
+            _update_pipeline(fields, now),
+            return_document=ReturnDocument.BEFORE
+        )
+        updated = before and _apply_update(before, fields, now)
+    else:
+        updated = await Todo.get_motor_collection().find_one(query)
+    if updated is None:
+        await _raise_write_miss(object_id, owner_id, version, conflict_status)
 
-    await todo_model.save()
+    if fields:
+        await stats_service.apply_delta(owner_id, completed=_completed_delta(before, updated))
+
+    todo_model = Todo.model_validate(updated)
+    response.headers['ETag'] = _etag(todo_model.version)
+    return todo_model
 
 
 @router.delete('/todo/delete-todo/{todo_id}', status_code=status.HTTP_204_NO_CONTENT)
-async def delete_todo(user: UserDependency, todo_id: str):
-    """Delete a todo."""
+async def delete_todo(
+    user: UserDependency,
+    todo_id: str,
+    version: Optional[int] = Query(None, ge=0),
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Delete a todo in a single owner-scoped round-trip.
+
+    Pass `version` or an `If-Match` header to delete only an unchanged todo.
+    """
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed"
         )
-    
-    todo_model = await Todo.get(PydanticObjectId(todo_id))
-    
-    if todo_model is None or todo_model.owner_id != user.get('id'):
+
+    object_id = _parse_object_id(todo_id)
+    if object_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Todo not found'
         )
 
-    await todo_model.delete()
+    owner_id = user.get('id')
+    version, conflict_status = _expected_version(version, if_match)
+    deleted = await Todo.get_motor_collection().find_one_and_delete(
+        _owner_filter(object_id, owner_id, version),
+        projection={'complete': 1}
+    )
+    if deleted is None:
+        await _raise_write_miss(object_id, owner_id, version, conflict_status)
+
+    await stats_service.apply_delta(owner_id, total=-1, completed=-int(bool(deleted.get('complete'))))
+
+
+@router.post('/batch', status_code=status.HTTP_200_OK)
+async def batch_todos(user: UserDependency, batch: TodoBatchRequest):
+    """
+    Apply many create/update/delete/complete operations in one request.
+
+    Ownership of every referenced todo is checked with a single query and all
+    writes go out as one unordered bulk_write. Each id may appear only once
+    per batch, since unordered writes have no defined order.
+
+    Updates and deletes are pinned to the version read by that query, so a
+    todo changed or deleted before the bulk_write is reported as a conflict
+    or not found rather than overwritten. An update whose `todo.version`
+    does not match is a conflict and is not sent.
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed"
+        )
+
+    owner_id = user.get('id')
+    collection = Todo.get_motor_collection()
+    now = datetime.utcnow()
+    write_id = ObjectId()
+
+    object_ids = {
+        index: _parse_object_id(operation.id)
+        for index, operation in enumerate(batch.operations)
+        if operation.op != 'create'
+    }
+    wanted = [object_id for object_id in object_ids.values() if object_id is not None]
+    # Owned todo id -> its completion and version, for the deltas and filters.
+    owned: Dict[ObjectId, Dict] = {}
+    if wanted:
+        cursor = collection.find(
+            {'_id': {'$in': wanted}, 'owner_id': owner_id}, {'complete': 1, 'version': 1}
+        )
+        owned = {doc['_id']: doc async for doc in cursor}
+
+    results: List[TodoBatchResult] = []
+    requests = []
+    request_positions = []
+    # (total, completed) counter change of each request, applied if it succeeds.
+    deltas: List[Tuple[int, int]] = []
+    # Position in `requests` -> todo id, for the version-pinned updates/deletes.
+    pinned: Dict[int, ObjectId] = {}
+    seen = set()
+    for index, operation in enumerate(batch.operations):
+        result = TodoBatchResult(index=index, op=operation.op, id=operation.id, status='not_found')
+        results.append(result)
+
+        if operation.op == 'create':
+            todo_model = Todo(**operation.todo.model_dump(exclude={'version'}), owner_id=owner_id, created_at=now)
+            todo_model.id = PydanticObjectId()
+            if operation.todo.complete:
+                todo_model.completed_at = now
+            request = InsertOne(get_dict(todo_model, to_db=True))
+            delta = (1, int(todo_model.complete))
+            result.id = str(todo_model.id)
+            result.status = 'created'
+        else:
+            object_id = object_ids[index]
+            if object_id not in owned:
+                result.detail = 'Todo not found'
+                continue
+            if object_id in seen:
+                result.status = 'error'
+                result.detail = 'Todo appears more than once in the batch'
+                continue
+            seen.add(object_id)
+
+            was_complete = bool(owned[object_id].get('complete'))
+            read_version = owned[object_id].get('version') or 0
+            expected = operation.todo.version if operation.op == 'update' else None
+            if expected is not None and expected != read_version:
+                result.status = 'conflict'
+                result.detail = 'Todo was modified by another request'
+                continue
+            owner_filter = _owner_filter(object_id, owner_id, read_version)
+            pinned[len(requests)] = object_id
+            if operation.op == 'delete':
+                request = DeleteOne(owner_filter)
+                delta = (-1, -int(was_complete))
+                result.status = 'deleted'
+            else:
+                fields = (
+                    operation.todo.model_dump(exclude={'version'}) if operation.op == 'update'
+                    else {'complete': operation.complete}
+                )
+                request = UpdateOne(owner_filter, _update_pipeline(fields, now, write_id))
+                delta = (0, int(fields['complete']) - int(was_complete))
+                result.status = 'updated'
+
+        requests.append(request)
+        request_positions.append(index)
+        deltas.append(delta)
+
+    if requests:
+        failed = set()
+        try:
+            outcome = (await collection.bulk_write(requests, ordered=False)).bulk_api_result
+        except BulkWriteError as exc:
+            outcome = exc.details
+            for error in outcome.get('writeErrors', []):
+                failed.add(error['index'])
+                result = results[request_positions[error['index']]]
+                result.status = 'error'
+                result.detail = error.get('errmsg')
+
+        sent = [position for position in pinned if position not in failed]
+        sent_deletes = [p for p in sent if isinstance(requests[p], DeleteOne)]
+        if (
+            outcome.get('nMatched', 0) == len(sent) - len(sent_deletes)
+            and outcome.get('nRemoved', 0) == len(sent_deletes)
+        ):
+            applied = [delta for position, delta in enumerate(deltas) if position not in failed]
+            if applied:
+                await stats_service.apply_delta(
+                    owner_id,
+                    total=sum(total for total, _ in applied),
+                    completed=sum(completed for _, completed in applied),
+                )
+        else:
+            # Some pinned writes matched nothing: the todo changed or went away
+            # after it was read. Find out which, and rebuild the counters.
+            await _settle_batch_misses(
+                collection, [(pinned[p], results[request_positions[p]]) for p in sent], write_id
+            )
+            await stats_service.reconcile_stats([owner_id])
+
+    return {'results': results}
+
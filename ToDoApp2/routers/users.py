@@ -2,13 +2,15 @@
 User management router for user profile and password management.
 """
 from typing import Annotated, Dict
+from beanie import PydanticObjectId
 from fastapi import APIRouter, Depends, HTTPException
 from starlette import status
 
 from ..models_beanie import User
-from ..schemas.user import UserVerification
+from ..schemas.user import TimezoneUpdate, UserVerification
 from ..core.dependencies import get_current_user
-from ..core.security import verify_password, hash_password
+from ..services import auth as auth_service
+from ..services.notifications import is_valid_timezone, next_reset_at, user_timezone
 
 
 router = APIRouter(
@@ -48,13 +50,42 @@ async def change_password(user: UserDependency, user_verification: UserVerificat
             detail='Authentication failed'
         )
     
-    user_doc = await User.get(user.get('id'))
-    
-    if not user_doc or not verify_password(user_verification.password, user_doc.hashed_password):
+    changed = await auth_service.change_password(
+        user.get('id'), user_verification.password, user_verification.new_password
+    )
+    if not changed:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect"
         )
-    
-    user_doc.hashed_password = hash_password(user_verification.new_password)
-    await user_doc.save()
\ No newline at end of file
+
+
+@router.put('/timezone', status_code=status.HTTP_204_NO_CONTENT)
+async def change_timezone(user: UserDependency, timezone_update: TimezoneUpdate):
+    """
+    Set the zone the user's day ends in (null for the app timezone).
+
+    The next daily reset moves to the coming midnight in the new zone.
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Authentication failed'
+        )
+
+    zone = timezone_update.timezone or None
+    if zone and not is_valid_timezone(zone):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown timezone '{zone}'"
+        )
+
+    result = await User.get_motor_collection().update_one(
+        {'_id': PydanticObjectId(user.get('id'))},
+        {'$set': {'timezone': zone, 'next_reset_at': next_reset_at(user_timezone(zone))}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='User not found'
+        )
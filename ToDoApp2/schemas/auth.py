@@ -1,6 +1,8 @@
 """
 Authentication-related Pydantic schemas.
 """
+from typing import Optional
+
 from pydantic import BaseModel, EmailStr
 
 
@@ -12,6 +14,7 @@ class CreateUserRequest(BaseModel):
     lastname: str
     password: str
     role: str
+    timezone: Optional[str] = None
 
 
 class Token(BaseModel):
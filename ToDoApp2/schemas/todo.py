@@ -1,7 +1,9 @@
 """
 Todo-related Pydantic schemas.
 """
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class TodoRequest(BaseModel):
@@ -10,6 +12,30 @@ class TodoRequest(BaseModel):
     description: str = Field(min_length=1, max_length=100)
     priority: int = Field(ge=1, le=5)
     complete: bool = False
+    # Expected current version for a conditional update; ignored on create.
+    version: Optional[int] = Field(default=None, ge=0)
+
+
+class TodoPatch(BaseModel):
+    """
+    Schema for a JSON Merge Patch of a todo.
+
+    Only the fields present in the body are changed. None of the patchable
+    fields are nullable, so an explicit null is rejected.
+    """
+    title: Optional[str] = Field(default=None, min_length=3)
+    description: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    priority: Optional[int] = Field(default=None, ge=1, le=5)
+    complete: Optional[bool] = None
+    # Expected current version for a conditional update.
+    version: Optional[int] = Field(default=None, ge=0)
+
+    @model_validator(mode='after')
+    def reject_nulls(self):
+        for field in self.model_fields_set - {'version'}:
+            if getattr(self, field) is None:
+                raise ValueError(f"'{field}' may not be null")
+        return self
 
 
 class TodoResponse(BaseModel):
@@ -20,3 +46,38 @@ class TodoResponse(BaseModel):
     priority: int
     complete: bool
     owner_id: str
+
+
+class TodoBatchOperation(BaseModel):
+    """
+    One operation in a batch request.
+
+    `create` needs `todo`, `update` needs `id` and `todo`, `delete` needs
+    `id`, and `complete` needs `id` and sets the todo's `complete` flag.
+    """
+    op: Literal['create', 'update', 'delete', 'complete']
+    id: Optional[str] = None
+    todo: Optional[TodoRequest] = None
+    complete: bool = True
+
+    @model_validator(mode='after')
+    def check_required_fields(self):
+        if self.op != 'create' and not self.id:
+            raise ValueError(f"'{self.op}' operations require an id")
+        if self.op in ('create', 'update') and self.todo is None:
+            raise ValueError(f"'{self.op}' operations require a todo")
+        return self
+
+
+class TodoBatchRequest(BaseModel):
+    """Schema for a batch of todo operations."""
+    operations: List[TodoBatchOperation] = Field(min_length=1, max_length=500)
+
+
+class TodoBatchResult(BaseModel):
+    """Outcome of a single batch operation."""
+    index: int
+    op: str
+    id: Optional[str] = None
+    status: Literal['created', 'updated', 'deleted', 'not_found', 'conflict', 'error']
+    detail: Optional[str] = None
@@ -1,6 +1,8 @@
 """
 User-related Pydantic schemas.
 """
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -14,3 +16,9 @@ class PasswordChange(BaseModel):
     """Schema for password change request."""
     current_password: str
     new_password: str = Field(min_length=6)
+
+
+class TimezoneUpdate(BaseModel):
+    """Schema for changing the zone the user's day ends in."""
+    # IANA zone name, e.g. "Europe/Berlin"; null for the app timezone.
+    timezone: Optional[str] = None
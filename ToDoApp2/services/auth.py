@@ -0,0 +1,156 @@
+"""
+Authentication service shared by the auth and user routers.
+"""
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ReturnDocument
+
+from ..config import settings
+from ..core.security import create_access_token, password_hasher
+from ..core.token_cache import token_cache
+from ..models_beanie import Session, User
+
+
+class UserCredentials(BaseModel):
+    """Projection of the user fields needed to authenticate."""
+    id: PydanticObjectId = Field(alias='_id')
+    username: str
+    hashed_password: str
+    role: str
+    is_active: bool = True
+
+
+async def get_credentials(username: str) -> Optional[UserCredentials]:
+    """Look up a user's credentials by username, fetching only the auth fields."""
+    return await User.find_one(
+        User.username == username, projection_model=UserCredentials
+    )
+
+
+async def authenticate_user(username: str, password: str) -> Optional[UserCredentials]:
+    """
+    Check a username/password pair.
+
+    Returns:
+        The user's credentials, or None if the user is unknown, inactive or
+        the password does not match
+    """
+    user = await get_credentials(username)
+    if user is None or not user.is_active:
+        return None
+    if not await password_hasher.verify(password, user.hashed_password):
+        return None
+    return user
+
+
+def issue_access_token(user: UserCredentials) -> str:
+    """Create an access token for an authenticated user."""
+    return create_access_token(user.username, str(user.id), user.role)
+
+
+async def change_password(user_id: str, current_password: str, new_password: str) -> bool:
+    """
+    Replace a user's password after verifying the current one.
+
+    Only the password hash is written and every cached token of the user is
+    dropped.
+
+    Returns:
+        False if the user does not exist or the current password is wrong
+    """
+    try:
+        object_id = PydanticObjectId(user_id)
+    except Exception:
+        return False
+
+    user = await User.find_one(User.id == object_id, projection_model=UserCredentials)
+    if user is None or not await password_hasher.verify(current_password, user.hashed_password):
+        return False
+
+    hashed_password = await password_hasher.hash(new_password)
+    await User.find_one(User.id == object_id).update(
+        {'$set': {'hashed_password': hashed_password}}
+    )
+    token_cache.invalidate_user(user_id)
+    await revoke_user_sessions(user_id)
+    return True
+
+
+def _token_digest(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+async def create_session(user: UserCredentials) -> str:
+    """
+    Start a refresh-token session for an authenticated user.
+
+    Returns:
+        The refresh token; only its digest is stored
+    """
+    refresh_token = secrets.token_urlsafe(32)
+    await Session(
+        token_hash=_token_digest(refresh_token),
+        user_id=str(user.id),
+        username=user.username,
+        role=user.role,
+        expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days),
+    ).insert()
+    return refresh_token
+
+
+async def refresh_session(refresh_token: str) -> Optional[Tuple[str, str]]:
+    """
+    Exchange a refresh token for a new access token.
+
+    The session is looked up and its refresh token rotated in one indexed
+    find_one_and_update; no password hashing is involved. The user is then
+    re-read, so a deleted or deactivated user's session is revoked instead,
+    and the new token carries the user's current role.
+
+    Returns:
+        (access_token, new_refresh_token), or None if the refresh token is
+        unknown, expired or revoked, or the user is gone or inactive
+    """
+    now = datetime.utcnow()
+    new_refresh_token = secrets.token_urlsafe(32)
+    session = await Session.get_motor_collection().find_one_and_update(
+        {
+            'token_hash': _token_digest(refresh_token),
+            'revoked_at': None,
+            'expires_at': {'$gt': now},
+        },
+        {'$set': {'token_hash': _token_digest(new_refresh_token), 'last_used_at': now}},
+        projection={'user_id': 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if session is None:
+        return None
+
+    user = await User.find_one(
+        User.id == PydanticObjectId(session['user_id']), projection_model=UserCredentials
+    )
+    if user is None or not user.is_active:
+        await revoke_user_sessions(session['user_id'])
+        return None
+    return issue_access_token(user), new_refresh_token
+
+
+async def revoke_session(refresh_token: str) -> None:
+    """Revoke the session a refresh token belongs to, e.g. on logout."""
+    await Session.get_motor_collection().update_one(
+        {'token_hash': _token_digest(refresh_token), 'revoked_at': None},
+        {'$set': {'revoked_at': datetime.utcnow()}}
+    )
+
+
+async def revoke_user_sessions(user_id: str) -> None:
+    """Revoke every session of a user, e.g. on password change."""
+    await Session.get_motor_collection().update_many(
+        {'user_id': user_id, 'revoked_at': None},
+        {'$set': {'revoked_at': datetime.utcnow()}}
+    )
@@ -0,0 +1,112 @@
+"""
+Per-user, per-day archive of todos taken before the nightly purge.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, time
+from typing import Dict, List, Optional, Tuple
+
+from ..core.pagination import encode_cursor, keyset_filter
+from ..models_beanie import Todo, TodoHistory
+
+logger = logging.getLogger(__name__)
+
+_COMPLETED = {"$size": {"$filter": {"input": "$todos", "cond": "$$this.complete"}}}
+
+
+async def archive_todos(filter: Dict, day: date) -> None:
+    """
+    Copy the todos matching `filter` into one history bucket per owner for `day`.
+
+    A single aggregation groups the todos by owner and $merges the buckets
+    into todo_history. A bucket that already exists (e.g. a rerun after a
+    failed purge) only gains the todos it does not hold yet.
+
+    Args:
+        filter: Todos to archive; the same filter the purge then deletes
+        day: The users' local date being archived
+    """
+    pipeline: List[Dict] = [
+        {"$match": filter},
+        {"$sort": {"owner_id": 1, "created_at": 1}},
+        {
+            "$group": {
+                "_id": "$owner_id",
+                "todos": {
+                    "$push": {
+                        "_id": "$_id",
+                        "title": "$title",
+                        "description": "$description",
+                        "priority": "$priority",
+                        "complete": "$complete",
+                        "created_at": "$created_at",
+                        "completed_at": "$completed_at",
+                    }
+                },
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "owner_id": "$_id",
+                "day": {"$literal": datetime.combine(day, time.min)},
+                "todos": 1,
+                "total": {"$size": "$todos"},
+                "completed": _COMPLETED,
+                "archived_at": {"$literal": datetime.utcnow()},
+            }
+        },
+        {
+            "$merge": {
+                "into": TodoHistory.get_collection_name(),
+                "on": ["owner_id", "day"],
+                "whenMatched": [
+                    {
+                        "$set": {
+                            "todos": {
+                                "$concatArrays": [
+                                    "$todos",
+                                    {
+                                        "$filter": {
+                                            "input": "$$new.todos",
+                                            "cond": {"$not": [{"$in": ["$$this._id", "$todos._id"]}]},
+                                        }
+                                    },
+                                ]
+                            },
+                            "archived_at": "$$new.archived_at",
+                        }
+                    },
+                    {"$set": {"total": {"$size": "$todos"}, "completed": _COMPLETED}},
+                ],
+                "whenNotMatched": "insert",
+            }
+        },
+    ]
+    await Todo.get_motor_collection().aggregate(pipeline, allowDiskUse=True).to_list(None)
+    logger.info("Archived todos for %s into %s", day, TodoHistory.get_collection_name())
+
+
+async def fetch_history_page(
+    owner_id: str, cursor: Optional[str], limit: int
+) -> Tuple[List[TodoHistory], Optional[str]]:
+    """
+    Fetch one page of a user's history buckets, newest day first.
+
+    Returns:
+        The page of buckets and the cursor for the next page (None on the last page)
+    """
+    # Days are unique per owner, so the owner_day_unique index alone gives the order.
+    query = {"owner_id": owner_id, **keyset_filter(cursor, field="day")}
+    buckets = await TodoHistory.find(query).sort([("day", -1)]).limit(limit + 1).to_list()
+
+    next_cursor = None
+    if len(buckets) > limit:
+        buckets = buckets[:limit]
+        last = buckets[-1]
+        next_cursor = encode_cursor(last.day, last.id)
+    return buckets, next_cursor
+
+
+__all__ = ["archive_todos", "fetch_history_page"]
@@ -0,0 +1,233 @@
+"""
+Mongo-backed leases so each scheduled job run happens in exactly one process.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Awaitable, Callable, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from ..config import settings
+from ..models_beanie import JobLease
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process as a lease owner.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLease:
+    """
+    A lease on one run of a scheduled job.
+
+    The lease document's _id is "<job>:<run key>". Acquiring is one atomic
+    upsert: it inserts a fresh lease, or takes over a running lease whose
+    holder stopped heartbeating. A lease held by someone else, or already
+    marked done or failed, makes the upsert hit the unique _id and fail, so
+    exactly one process wins. Finished runs keep a "done" or "failed" lease
+    for the retention period so late-firing processes skip that run; a
+    failed run is retried on the job's next trigger, not by every waiting
+    process.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        ttl_seconds: int = 60,
+        retention_hours: int = 24,
+        owner: str = WORKER_ID,
+    ):
+        self.key = key
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.retention = timedelta(hours=retention_hours)
+        self.owner = owner
+
+    @property
+    def heartbeat_seconds(self) -> float:
+        return self.ttl.total_seconds() / 3
+
+    async def try_acquire(self) -> bool:
+        """Take the lease if it is free or its holder died."""
+        now = datetime.utcnow()
+        try:
+            lease = await JobLease.get_motor_collection().find_one_and_update(
+                {
+                    "_id": self.key,
+                    "status": "running",
+                    "$or": [{"expires_at": {"$lte": now}}, {"owner": self.owner}],
+                },
+                {
+                    "$set": {
+                        "owner": self.owner,
+                        "acquired_at": now,
+                        "heartbeat_at": now,
+                        "expires_at": now + self.ttl,
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            return False
+        return lease is not None and lease["owner"] == self.owner
+
+    async def renew(self) -> bool:
+        """Extend the lease; False means it was lost to another process."""
+        now = datetime.utcnow()
+        result = await JobLease.get_motor_collection().update_one(
+            {"_id": self.key, "owner": self.owner, "status": "running"},
+            {"$set": {"heartbeat_at": now, "expires_at": now + self.ttl}},
+        )
+        return result.matched_count == 1
+
+    async def complete(self) -> None:
+        """Mark the run done so no other process repeats it."""
+        await JobLease.get_motor_collection().update_one(
+            {"_id": self.key, "owner": self.owner},
+            {"$set": {"status": "done", "expires_at": datetime.utcnow() + self.retention}},
+        )
+
+    async def fail(self) -> None:
+        """Mark the run failed so waiting processes stop instead of repeating it."""
+        await JobLease.get_motor_collection().update_one(
+            {"_id": self.key, "owner": self.owner},
+            {"$set": {"status": "failed", "expires_at": datetime.utcnow() + self.retention}},
+        )
+
+    async def release(self) -> None:
+        """Give the lease up so a waiting process can take over."""
+        await JobLease.get_motor_collection().delete_one({"_id": self.key, "owner": self.owner})
+
+    async def wait_for_turn(self) -> bool:
+        """
+        Wait while another process runs this job.
+
+        Returns:
+            True if the holder died and this process took the lease over,
+            False once the run is done or has failed
+        """
+        collection = JobLease.get_motor_collection()
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            lease = await collection.find_one({"_id": self.key}, {"status": 1})
+            if lease is not None and lease["status"] in ("done", "failed"):
+                return False
+            if await self.try_acquire():
+                return True
+
+
+async def run_exclusive(
+    job_name: str,
+    func: Callable[[], Awaitable[None]],
+    run_key: Optional[str] = None,
+    repeating: bool = False,
+) -> bool:
+    """
+    Run `func` only if this process wins the lease for this run.
+
+    The holder heartbeats while the job runs and the job is cancelled if the
+    lease is lost. Other processes wait and take over only if the holder
+    dies; if the job raises, the run is marked failed and they stop waiting.
+
+    A `repeating` job (one that drains whatever work is due, e.g. every few
+    minutes) has a single lease for the job instead of one per run: it is
+    held for as long as a run lasts, however many firings that spans, and
+    released at the end, failed or not, so the next firing retries. Processes
+    that find it held skip their firing, since the running process will pick
+    up their work.
+
+    Args:
+        job_name: Scheduled job id
+        func: The job coroutine function
+        run_key: Identifies the run; defaults to the current UTC minute, which
+            matches across processes firing the same cron trigger. Ignored
+            for repeating jobs.
+        repeating: Keep one lease per job rather than per run
+
+    Returns:
+        True if this process ran the job
+    """
+    if repeating:
+        run_key = "active"
+    run_key = run_key or datetime.utcnow().strftime("%Y-%m-%dT%H:%M")
+    lease = LeaderLease(
+        f"{job_name}:{run_key}",
+        ttl_seconds=settings.job_lease_ttl_seconds,
+        retention_hours=settings.job_lease_retention_hours,
+    )
+
+    if not await lease.try_acquire():
+        if repeating:
+            logger.info("Job %s is still running elsewhere; skipping this firing", job_name)
+            return False
+        logger.info("Job %s (%s) is running elsewhere; standing by", job_name, run_key)
+        if not await lease.wait_for_turn():
+            return False
+        logger.warning("Took over job %s (%s) from a dead holder", job_name, run_key)
+
+    job = asyncio.create_task(func())
+    try:
+        while True:
+            done, _ = await asyncio.wait({job}, timeout=lease.heartbeat_seconds)
+            if done:
+                break
+            if not await lease.renew():
+                logger.error("Lost lease for job %s (%s); cancelling", job_name, run_key)
+                job.cancel()
+                return False
+        job.result()
+    except asyncio.CancelledError:
+        job.cancel()
+        await lease.release()
+        raise
+    except Exception:
+        logger.exception("Job %s (%s) failed", job_name, run_key)
+        if repeating:
+            await lease.release()
+        else:
+            await lease.fail()
+        return True
+
+    if repeating:
+        await lease.release()
+    else:
+        await lease.complete()
+    logger.info("Job %s (%s) completed by %s", job_name, run_key, lease.owner)
+    return True
+
+
+def exclusive(
+    job_name: str,
+    func: Callable[[], Awaitable[None]],
+    run_key: Optional[Callable[[], str]] = None,
+    repeating: bool = False,
+) -> Callable[[], Awaitable[bool]]:
+    """
+    Wrap a scheduled job so only one process runs each firing.
+
+    Args:
+        job_name: Scheduled job id
+        func: The job coroutine function
+        run_key: Returns the key of the current run; processes whose triggers
+            fire a little apart must compute the same key
+        repeating: See run_exclusive
+    """
+
+    @wraps(func)
+    async def wrapper() -> bool:
+        return await run_exclusive(
+            job_name, func, run_key() if run_key else None, repeating=repeating
+        )
+
+    return wrapper
+
+
+__all__ = ["LeaderLease", "WORKER_ID", "exclusive", "run_exclusive"]
@@ -0,0 +1,167 @@
+"""
+Pooled SMTP delivery with bounded concurrency.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import smtplib
+import time
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Dict, List, Optional, Sequence
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors after which a connection is discarded and the send retried once on a
+# fresh one. Per-message rejections (bad recipient etc.) keep the connection.
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+@dataclass
+class _Connection:
+    server: Optional[smtplib.SMTP] = None
+    sent: int = 0
+
+
+class SMTPMailer:
+    """
+    Keeps up to `pool_size` authenticated SMTP sessions open and reuses each
+    one for up to `max_messages_per_connection` messages.
+
+    smtplib is blocking, so every send runs in a worker thread; at most
+    `pool_size` sends are in flight, one per connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        use_ssl: bool = False,
+        pool_size: int = 4,
+        max_messages_per_connection: int = 100,
+        timeout: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.pool_size = pool_size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+        self._slots: Optional[asyncio.Queue] = None
+        self._connections: List[_Connection] = []
+        self.sent = 0
+        self.failed = 0
+        self.reconnects = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "SMTPMailer":
+        return cls(
+            host=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_username,
+            password=settings.smtp_password,
+            use_tls=settings.smtp_use_tls,
+            use_ssl=not settings.smtp_use_tls,
+            pool_size=settings.smtp_pool_size,
+            max_messages_per_connection=settings.smtp_max_messages_per_connection,
+        )
+
+    async def send(self, message: EmailMessage) -> None:
+        """Send one message on a pooled connection, waiting for a free one."""
+        if self._slots is None:
+            self._slots = asyncio.Queue()
+            self._connections = [_Connection() for _ in range(self.pool_size)]
+            for connection in self._connections:
+                self._slots.put_nowait(connection)
+
+        connection = await self._slots.get()
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._send_blocking, connection, message)
+            self.sent += 1
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._slots.put_nowait(connection)
+            elapsed = time.perf_counter() - started
+            self._total_seconds += elapsed
+            self._max_seconds = max(self._max_seconds, elapsed)
+            logger.debug("SMTP send to %s took %.1fms", message["To"], elapsed * 1000)
+
+    async def send_many(self, messages: Sequence[EmailMessage]) -> List[Optional[Exception]]:
+        """
+        Send messages concurrently across the pool.
+
+        Returns:
+            One entry per message: None on success, otherwise the exception
+        """
+        results = await asyncio.gather(
+            *(self.send(message) for message in messages), return_exceptions=True
+        )
+        return [result if isinstance(result, Exception) else None for result in results]
+
+    def _send_blocking(self, connection: _Connection, message: EmailMessage) -> None:
+        for attempt in (1, 2):
+            if connection.server is None or connection.sent >= self.max_messages_per_connection:
+                self._close_connection(connection)
+                connection.server = self._connect()
+            try:
+                connection.server.send_message(message)
+                connection.sent += 1
+                return
+            except RECONNECT_ERRORS:
+                self._close_connection(connection)
+                self.reconnects += 1
+                if attempt == 2:
+                    raise
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        if self.use_tls and not self.use_ssl:
+            server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        return server
+
+    @staticmethod
+    def _close_connection(connection: _Connection) -> None:
+        if connection.server is not None:
+            try:
+                connection.server.quit()
+            except (smtplib.SMTPException, OSError):
+                connection.server.close()
+        connection.server = None
+        connection.sent = 0
+
+    async def close(self) -> None:
+        """Quit every open SMTP session."""
+        for connection in self._connections:
+            await asyncio.to_thread(self._close_connection, connection)
+
+    def stats(self) -> Dict:
+        attempts = self.sent + self.failed
+        return {
+            'pool_size': self.pool_size,
+            'open_connections': sum(1 for c in self._connections if c.server is not None),
+            'sent': self.sent,
+            'failed': self.failed,
+            'reconnects': self.reconnects,
+            'avg_latency_ms': round(self._total_seconds / attempts * 1000, 2) if attempts else 0.0,
+            'max_latency_ms': round(self._max_seconds * 1000, 2),
+        }
+
+
+__all__ = ["SMTPMailer"]
@@ -3,17 +3,23 @@ Background jobs for emailing daily summaries and resetting todos.
 """
 from __future__ import annotations
 
-import asyncio
 import logging
-import smtplib
-from datetime import datetime
-from email.message import EmailMessage
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
 from textwrap import dedent
-from typing import List, Sequence
-from zoneinfo import ZoneInfo
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from bson import ObjectId
+from pymongo import UpdateOne
 
 from ..config import settings
 from ..models_beanie import Todo, User
+from .history import archive_todos
+from .outbox import enqueue
+from .purge import purge_todos
+from .stats import reconcile_stats
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +30,58 @@ except Exception:  # pragma: no cover - fallback path
     APP_TZ = ZoneInfo("UTC")
 
 
+def is_valid_timezone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def user_timezone(name: Optional[str]) -> ZoneInfo:
+    """A user's zone, falling back to the app timezone when unset or unknown."""
+    if name and is_valid_timezone(name):
+        return ZoneInfo(name)
+    return APP_TZ
+
+
+def next_reset_at(tz: ZoneInfo, after: Optional[datetime] = None) -> datetime:
+    """
+    The first local midnight in `tz` after `after`.
+
+    Args:
+        tz: The user's zone
+        after: Naive UTC datetime, defaults to now
+
+    Returns:
+        Naive UTC datetime, as stored on User.next_reset_at
+    """
+    after = after or datetime.utcnow()
+    local = after.replace(tzinfo=timezone.utc).astimezone(tz)
+    midnight = datetime.combine(local.date() + timedelta(days=1), time.min, tzinfo=tz)
+    return midnight.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class UserSummary:
+    """One user's end-of-day numbers and task rows."""
+    user_id: str
+    email: Optional[str]
+    username: Optional[str]
+    first_name: Optional[str]
+    total: int = 0
+    completed: int = 0
+    tasks: List[Dict] = field(default_factory=list)
+
+
 async def send_daily_summaries_and_reset():
     """
-    Send end-of-day summaries to every user and purge todos for a fresh start.
+    Queue end-of-day summaries for every user and purge todos for a fresh start.
+
+    Summaries go to the email outbox and are delivered by the outbox worker,
+    so the job itself only builds and bulk-inserts them. With PURGE_MODE=swap
+    the whole collection is replaced, so todos added after the cutoff are
+    dropped too, without a summary or archive entry.
     """
     if not settings.daily_reset_enabled:
         logger.debug("Daily reset disabled; skipping scheduled purge.")
@@ -34,45 +89,257 @@ async def send_daily_summaries_and_reset():
 
     summary_date = datetime.now(tz=APP_TZ)
     logger.info("Running daily summary + purge for %s", summary_date.date())
+    # Summarise, archive and purge exactly the same todos; ones added while
+    # the job runs are left for tomorrow.
+    cutoff = datetime.utcnow()
+
+    if settings.summary_email_enabled:
+        if _email_configured():
+            await _enqueue_summaries(summary_date, created_before=cutoff)
+        else:
+            logger.error("Summary email enabled but SMTP credentials missing. Skipping emails.")
+
+    purge_filter = {"created_at": {"$lt": cutoff}}
+    if settings.archive_enabled:
+        await archive_todos(purge_filter, summary_date.date())
+
+    # Swap cannot filter; it empties the collection regardless of the cutoff.
+    result = await purge_todos({} if settings.purge_mode == "swap" else purge_filter)
+    await reconcile_stats()
+    logger.info(
+        "Daily purge complete (%s%s). Deleted %s of %s todos in %s batches, %.2fs.",
+        result.mode, ", dry run" if result.dry_run else "",
+        result.deleted, result.matched, result.batches, result.seconds,
+    )
 
-    users: List[User] = await User.find_all().to_list()
 
-    if settings.summary_email_enabled and not _email_configured():
-        logger.error("Summary email enabled but SMTP credentials missing. Skipping emails.")
+async def reset_due_users(now: Optional[datetime] = None) -> int:
+    """
+    Send summaries to and purge the todos of users whose local day has ended.
+
+    Due users come from an indexed range query on User.next_reset_at, so each
+    run only touches the timezones that just passed midnight. Users are
+    handled in batches, grouped by zone, and then moved to their next
+    midnight.
+
+    Returns:
+        Number of users reset
+    """
+    if not settings.daily_reset_enabled:
+        logger.debug("Daily reset disabled; skipping scheduled purge.")
+        return 0
 
-    for user in users:
-        await _send_summary_for_user(user, summary_date)
+    now = now or datetime.utcnow()
+    send_summaries = settings.summary_email_enabled and _email_configured()
+    if settings.summary_email_enabled and not send_summaries:
+        logger.error("Summary email enabled but SMTP credentials missing. Skipping emails.")
 
-    delete_result = await Todo.find_all().delete()
-    deleted_count = getattr(delete_result, "deleted_count", delete_result)
-    logger.info("Daily purge complete. Deleted %s todos.", deleted_count)
+    collection = User.get_motor_collection()
+    handled = 0
+    while True:
+        due = await collection.find(
+            {"next_reset_at": {"$lte": now}}, {"timezone": 1, "next_reset_at": 1}
+        ).sort("next_reset_at", 1).limit(settings.reset_batch_size).to_list(settings.reset_batch_size)
+        if not due:
+            break
+
+        groups: Dict[Tuple[Optional[str], datetime], List[str]] = defaultdict(list)
+        for user in due:
+            groups[(user.get("timezone"), user["next_reset_at"])].append(str(user["_id"]))
+        for (tz_name, reset_at), owner_ids in groups.items():
+            await _reset_users(owner_ids, user_timezone(tz_name), reset_at, send_summaries)
+
+        await collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": user["_id"]},
+                    {"$set": {"next_reset_at": next_reset_at(user_timezone(user.get("timezone")), now)}},
+                )
+                for user in due
+            ],
+            ordered=False,
+        )
+        handled += len(due)
+
+    if handled:
+        logger.info("Reset %s users whose day ended", handled)
+    return handled
+
+
+async def _reset_users(
+    owner_ids: List[str], tz: ZoneInfo, reset_at: datetime, send_summaries: bool
+) -> None:
+    # The day that just ended, in the users' zone.
+    summary_date = (reset_at - timedelta(seconds=1)).replace(tzinfo=timezone.utc).astimezone(tz)
+    # Todos added after local midnight belong to the new day: they are left
+    # out of this summary and survive the purge.
+    if send_summaries:
+        await _enqueue_summaries(summary_date, owner_ids, created_before=reset_at)
+    purge_filter = {"owner_id": {"$in": owner_ids}, "created_at": {"$lt": reset_at}}
+    if settings.archive_enabled:
+        await archive_todos(purge_filter, summary_date.date())
+    # Swap would empty every user's todos; per-user resets always batch.
+    result = await purge_todos(purge_filter, mode="batched")
+    await reconcile_stats(owner_ids)
+    logger.info(
+        "Reset %s users in %s for %s: deleted %s todos",
+        len(owner_ids), tz.key, summary_date.date(), result.deleted,
+    )
 
 
-async def _send_summary_for_user(user: User, summary_date: datetime) -> None:
-    if not settings.summary_email_enabled or not _email_configured():
-        return
+async def backfill_next_resets() -> int:
+    """Give every user without a next_reset_at one, e.g. after upgrading."""
+    collection = User.get_motor_collection()
+    updated = 0
+    while True:
+        users = await collection.find(
+            {"next_reset_at": None}, {"timezone": 1}
+        ).limit(settings.reset_batch_size).to_list(settings.reset_batch_size)
+        if not users:
+            break
+        await collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": user["_id"]},
+                    {"$set": {"next_reset_at": next_reset_at(user_timezone(user.get("timezone")))}},
+                )
+                for user in users
+            ],
+            ordered=False,
+        )
+        updated += len(users)
+    if updated:
+        logger.info("Scheduled the next reset for %s users", updated)
+    return updated
+
+
+def _summary_stages(
+    owner_ids: Optional[Sequence[str]] = None, created_before: Optional[datetime] = None
+) -> List[Dict]:
+    """Aggregation grouping todos into one summary row per user, joined to the user."""
+    match: Dict = {}
+    if owner_ids is not None:
+        match["owner_id"] = {"$in": list(owner_ids)}
+    if created_before is not None:
+        match["created_at"] = {"$lt": created_before}
+
+    return [
+        {"$match": match},
+        {"$sort": {"owner_id": 1, "created_at": 1}},
+        {
+            "$group": {
+                "_id": "$owner_id",
+                "total": {"$sum": 1},
+                "completed": {"$sum": {"$cond": ["$complete", 1, 0]}},
+                "tasks": {
+                    "$push": {
+                        "title": "$title",
+                        "description": "$description",
+                        "priority": "$priority",
+                        "complete": "$complete",
+                    }
+                },
+            }
+        },
+        {
+            "$lookup": {
+                "from": User.get_collection_name(),
+                "let": {
+                    "owner": {
+                        "$convert": {"input": "$_id", "to": "objectId", "onError": None, "onNull": None}
+                    }
+                },
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$owner"]}}},
+                    {"$project": {"email": 1, "username": 1, "first_name": 1}},
+                ],
+                "as": "user",
+            }
+        },
+        {"$unwind": "$user"},
+    ]
 
-    todos = await Todo.find(Todo.owner_id == str(user.id)).to_list()
-    subject = f"Your Todo Summary · {summary_date.strftime('%b %d, %Y')}"
-    body = _build_email_body(user, todos, summary_date)
-    recipient = user.email
-    if recipient:
-        try:
-            await _send_email(subject, body, recipient)
-            logger.info("Sent daily summary email to %s", recipient)
-        except Exception as exc:  # pragma: no cover - logging only
-            logger.exception("Failed to send summary email to %s: %s", recipient, exc)
-    else:
-        logger.warning("User %s missing email address; skipping summary.", user.id)
 
+async def iter_user_summaries(
+    owner_ids: Optional[Sequence[str]] = None, created_before: Optional[datetime] = None
+) -> AsyncIterator[UserSummary]:
+    """
+    Yield a summary per user from one grouped aggregation over todos.
 
-def _build_email_body(user: User, todos: Sequence[Todo], summary_date: datetime) -> str:
-    total = len(todos)
-    completed = len([todo for todo in todos if todo.complete])
+    Todos are grouped by owner and joined to their user with $lookup in a
+    single streamed cursor; users without todos are then picked up in one
+    projected pass over users. Pass `owner_ids` to limit it to those users
+    and `created_before` to count only todos created before that instant
+    (the purge cutoff).
+    """
+    seen: Set[str] = set()
+    cursor = Todo.get_motor_collection().aggregate(
+        _summary_stages(owner_ids, created_before), allowDiskUse=True
+    )
+    async for row in cursor:
+        user = row["user"]
+        seen.add(row["_id"])
+        yield UserSummary(
+            user_id=row["_id"],
+            email=user.get("email"),
+            username=user.get("username"),
+            first_name=user.get("first_name"),
+            total=row["total"],
+            completed=row["completed"],
+            tasks=row["tasks"],
+        )
+
+    user_filter: Dict = {}
+    if owner_ids is not None:
+        user_filter = {"_id": {"$in": [ObjectId(owner_id) for owner_id in owner_ids if ObjectId.is_valid(owner_id)]}}
+    users = User.get_motor_collection().find(
+        user_filter, {"email": 1, "username": 1, "first_name": 1}
+    )
+    async for user in users:
+        user_id = str(user["_id"])
+        if user_id in seen:
+            continue
+        yield UserSummary(
+            user_id=user_id,
+            email=user.get("email"),
+            username=user.get("username"),
+            first_name=user.get("first_name"),
+        )
+
+
+async def _enqueue_summaries(
+    summary_date: datetime,
+    owner_ids: Optional[Sequence[str]] = None,
+    created_before: Optional[datetime] = None,
+) -> None:
+    enqueued = await enqueue(_summary_messages(summary_date, owner_ids, created_before))
+    logger.info("Queued %s summary emails", enqueued)
+
+
+async def _summary_messages(
+    summary_date: datetime,
+    owner_ids: Optional[Sequence[str]] = None,
+    created_before: Optional[datetime] = None,
+) -> AsyncIterator[Dict]:
+    subject = f"Your Todo Summary · {summary_date.strftime('%b %d, %Y')}"
+    async for summary in iter_user_summaries(owner_ids, created_before):
+        if not summary.email:
+            logger.warning("User %s missing email address; skipping summary.", summary.user_id)
+            continue
+        yield {
+            "recipient": summary.email,
+            "subject": subject,
+            "body": _build_email_body(summary, summary_date),
+        }
+
+
+def _build_email_body(summary: UserSummary, summary_date: datetime) -> str:
+    total = summary.total
+    completed = summary.completed
     pending = total - completed
 
     lines = [
-        f"Hey {user.first_name or user.username},",
+        f"Hey {summary.first_name or summary.username},",
         "",
         f"Here is your todo snapshot for {summary_date.strftime('%A, %d %B %Y')}:",
         f"• Total tasks: {total}",
@@ -81,13 +348,13 @@ def _build_email_body(user: User, todos: Sequence[Todo], summary_date: datetime)
         "",
     ]
 
-    if todos:
+    if summary.tasks:
         lines.append("Tasks:")
-        for idx, todo in enumerate(todos, start=1):
-            status = "Done" if todo.complete else "Pending"
+        for idx, todo in enumerate(summary.tasks, start=1):
+            status = "Done" if todo.get("complete") else "Pending"
             lines.append(
-                f"{idx}. {todo.title} [{status}] (Priority {todo.priority})"
-                f"\n   {todo.description}"
+                f"{idx}. {todo.get('title')} [{status}] (Priority {todo.get('priority')})"
+                f"\n   {todo.get('description')}"
             )
     else:
         lines.append("Looks like you had a clean slate today. Great job!")
@@ -114,30 +381,11 @@ def _email_configured() -> bool:
     )
 
 
-async def _send_email(subject: str, body: str, recipient: str) -> None:
-    message = EmailMessage()
-    sender = settings.email_from or settings.smtp_username
-    if not sender:
-        raise RuntimeError("Missing sender email address.")
-
-    message["From"] = sender
-    message["To"] = recipient
-    message["Subject"] = subject
-    message.set_content(body)
-
-    await asyncio.to_thread(_send_email_blocking, message)
-
-
-def _send_email_blocking(message: EmailMessage) -> None:
-    smtp_class = smtplib.SMTP_SSL if not settings.smtp_use_tls else smtplib.SMTP
-    with smtp_class(settings.smtp_host, settings.smtp_port, timeout=30) as server:
-        if settings.smtp_use_tls:
-            server.starttls()
-        if settings.smtp_username and settings.smtp_password:
-            server.login(settings.smtp_username, settings.smtp_password)
-        server.send_message(message)
-
-
-__all__ = ["send_daily_summaries_and_reset"]
-
-
+__all__ = [
+    "backfill_next_resets",
+    "is_valid_timezone",
+    "next_reset_at",
+    "reset_due_users",
+    "send_daily_summaries_and_reset",
+    "user_timezone",
+]
@@ -0,0 +1,216 @@
+"""
+Persistent email outbox and the background worker that delivers it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import AsyncIterable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from ..config import settings
+from ..models_beanie import OutboxMessage
+from .mailer import SMTPMailer
+
+logger = logging.getLogger(__name__)
+
+ENQUEUE_BATCH_SIZE = 1000
+
+
+def build_message(subject: str, body: str, recipient: str) -> EmailMessage:
+    message = EmailMessage()
+    sender = settings.email_from or settings.smtp_username
+    if not sender:
+        raise RuntimeError("Missing sender email address.")
+
+    message["From"] = sender
+    message["To"] = recipient
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
+
+
+async def enqueue(messages: AsyncIterable[Dict]) -> int:
+    """
+    Insert messages into the outbox in bulk.
+
+    Args:
+        messages: Dicts with recipient, subject and body
+
+    Returns:
+        Number of messages enqueued
+    """
+    collection = OutboxMessage.get_motor_collection()
+    batch: List[Dict] = []
+    enqueued = 0
+    async for message in messages:
+        now = datetime.utcnow()
+        batch.append({
+            **message,
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+        })
+        if len(batch) >= ENQUEUE_BATCH_SIZE:
+            await collection.insert_many(batch, ordered=False)
+            enqueued += len(batch)
+            batch = []
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+        enqueued += len(batch)
+    return enqueued
+
+
+async def outbox_counts() -> Dict[str, int]:
+    """Number of outbox messages per status."""
+    pipeline = [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+    cursor = OutboxMessage.get_motor_collection().aggregate(pipeline)
+    return {row["_id"]: row["count"] async for row in cursor}
+
+
+class OutboxWorker:
+    """
+    Delivers outbox messages with a pool of concurrent claim loops.
+
+    Each loop claims one due message at a time with an atomic
+    find_one_and_update, so any number of processes can run workers against
+    the same outbox. A claim holds a lock for `lock_seconds`; if the process
+    dies mid-send the message becomes claimable again once the lock expires.
+    Failed sends are retried with exponential backoff up to `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        mailer: SMTPMailer,
+        concurrency: int = 4,
+        poll_seconds: float = 5.0,
+        lock_seconds: int = 120,
+        max_attempts: int = 5,
+        retry_base_seconds: int = 30,
+    ):
+        self.mailer = mailer
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.lock_seconds = lock_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self._tasks: List[asyncio.Task] = []
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+
+    @classmethod
+    def from_settings(cls) -> "OutboxWorker":
+        return cls(
+            mailer=SMTPMailer.from_settings(),
+            concurrency=settings.outbox_workers,
+            poll_seconds=settings.outbox_poll_seconds,
+            lock_seconds=settings.outbox_lock_seconds,
+            max_attempts=settings.outbox_max_attempts,
+            retry_base_seconds=settings.outbox_retry_base_seconds,
+        )
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"outbox-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        logger.info("Outbox worker started with %s delivery loops", self.concurrency)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.mailer.close()
+        logger.info("Outbox worker stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                message = await self.claim()
+                if message is None:
+                    await asyncio.sleep(self.poll_seconds)
+                    continue
+                await self._deliver(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - logging only
+                logger.exception("Outbox loop error: %s", exc)
+                await asyncio.sleep(self.poll_seconds)
+
+    async def claim(self) -> Optional[Dict]:
+        """Atomically lock the next due message, or return None if there is none."""
+        now = datetime.utcnow()
+        return await OutboxMessage.get_motor_collection().find_one_and_update(
+            {
+                "$or": [
+                    {"status": "pending", "next_attempt_at": {"$lte": now}},
+                    {"status": "sending", "locked_until": {"$lte": now}},
+                ]
+            },
+            {
+                "$set": {"status": "sending", "locked_until": now + timedelta(seconds=self.lock_seconds)},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _deliver(self, message: Dict) -> None:
+        collection = OutboxMessage.get_motor_collection()
+        claimed = {"_id": message["_id"], "status": "sending"}
+        try:
+            await self.mailer.send(
+                build_message(message["subject"], message["body"], message["recipient"])
+            )
+        except Exception as exc:
+            attempts = message.get("attempts", 1)
+            if attempts >= self.max_attempts:
+                self.failed += 1
+                logger.error("Giving up on email to %s after %s attempts: %s", message["recipient"], attempts, exc)
+                update = {"status": "failed", "locked_until": None, "last_error": str(exc)}
+            else:
+                self.retried += 1
+                delay = self.retry_base_seconds * 2 ** (attempts - 1)
+                logger.warning("Email to %s failed (attempt %s), retrying in %ss: %s", message["recipient"], attempts, delay, exc)
+                update = {
+                    "status": "pending",
+                    "locked_until": None,
+                    "last_error": str(exc),
+                    "next_attempt_at": datetime.utcnow() + timedelta(seconds=delay),
+                }
+            await collection.update_one(claimed, {"$set": update})
+            return
+
+        self.delivered += 1
+        await collection.update_one(
+            claimed,
+            {"$set": {"status": "sent", "sent_at": datetime.utcnow(), "locked_until": None}},
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "concurrency": self.concurrency,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "failed": self.failed,
+            "mailer": self.mailer.stats(),
+        }
+
+
+outbox_worker = OutboxWorker.from_settings()
+
+
+__all__ = ["OutboxWorker", "build_message", "enqueue", "outbox_counts", "outbox_worker"]
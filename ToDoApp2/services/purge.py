@@ -0,0 +1,143 @@
+"""
+Throttled purge of todos for the daily reset.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from bson import ObjectId
+
+from ..config import settings
+from ..models_beanie import DECLARED_INDEXES, Todo
+
+logger = logging.getLogger(__name__)
+
+PURGE_MODES = ("batched", "swap")
+
+
+@dataclass
+class PurgeResult:
+    """What a purge run matched and removed."""
+    mode: str
+    dry_run: bool
+    matched: int = 0
+    deleted: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+async def purge_todos(
+    filter: Optional[Dict] = None,
+    mode: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    pause_ms: Optional[int] = None,
+    dry_run: Optional[bool] = None,
+) -> PurgeResult:
+    """
+    Delete todos without one unbounded delete_many.
+
+    "batched" walks the collection in `_id` order and deletes one `_id` range
+    of `batch_size` documents at a time, sleeping `pause_ms` in between so the
+    oplog and other writers keep up. Only todos created before the purge
+    started are deleted. "swap" (whole collection only) builds an empty
+    collection with the same indexes and renames it over the old one; todos
+    written while the swap runs are lost, so it is meant for quiet windows.
+
+    Args:
+        filter: Extra conditions on the todos to delete; must be empty for swap
+        mode: "batched" or "swap", defaults to settings.purge_mode
+        batch_size: Documents per delete, defaults to settings.purge_batch_size
+        pause_ms: Sleep between batches, defaults to settings.purge_batch_pause_ms
+        dry_run: Only count and log what would be deleted
+
+    Returns:
+        The purge result
+    """
+    filter = filter or {}
+    mode = mode or settings.purge_mode
+    batch_size = batch_size or settings.purge_batch_size
+    pause_ms = settings.purge_batch_pause_ms if pause_ms is None else pause_ms
+    dry_run = settings.purge_dry_run if dry_run is None else dry_run
+
+    if mode not in PURGE_MODES:
+        logger.warning("Unknown purge mode '%s'; falling back to 'batched'.", mode)
+        mode = "batched"
+    if mode == "swap" and filter:
+        logger.warning("Swap purge cannot apply a filter; using batched mode.")
+        mode = "batched"
+
+    started = time.monotonic()
+    cutoff = ObjectId.from_datetime(datetime.utcnow())
+    query = {**filter, "_id": {"$lt": cutoff}}
+    collection = Todo.get_motor_collection()
+    result = PurgeResult(mode=mode, dry_run=dry_run)
+    result.matched = await collection.count_documents(query)
+
+    if dry_run:
+        logger.info(
+            "Dry run: purge (%s) would delete %s todos in %s batches of %s",
+            mode, result.matched, math.ceil(result.matched / batch_size), batch_size,
+        )
+    elif mode == "swap":
+        result.deleted = await _swap_collection()
+        result.batches = 1
+    else:
+        await _delete_in_batches(query, batch_size, pause_ms, result)
+
+    result.seconds = round(time.monotonic() - started, 2)
+    return result
+
+
+async def _delete_in_batches(query: Dict, batch_size: int, pause_ms: int, result: PurgeResult) -> None:
+    collection = Todo.get_motor_collection()
+    lower: Optional[ObjectId] = None
+    while True:
+        batch_query = query
+        if lower is not None:
+            batch_query = {"$and": [query, {"_id": {"$gt": lower}}]}
+        ids = [
+            doc["_id"]
+            async for doc in collection.find(batch_query, {"_id": 1}).sort("_id", 1).limit(batch_size)
+        ]
+        if not ids:
+            return
+
+        deleted = await collection.delete_many(
+            {"$and": [query, {"_id": {"$gte": ids[0], "$lte": ids[-1]}}]}
+        )
+        lower = ids[-1]
+        result.deleted += deleted.deleted_count
+        result.batches += 1
+        logger.info(
+            "Purge batch %s: deleted %s/%s todos", result.batches, result.deleted, result.matched
+        )
+        if len(ids) < batch_size:
+            return
+        if pause_ms:
+            await asyncio.sleep(pause_ms / 1000)
+
+
+async def _swap_collection() -> int:
+    """Replace the todos collection with an empty copy carrying the same indexes."""
+    collection = Todo.get_motor_collection()
+    database = collection.database
+    replacement = database[f"{collection.name}_purge_tmp"]
+    await replacement.drop()
+    await database.create_collection(replacement.name)
+    indexes = DECLARED_INDEXES[Todo]
+    if indexes:
+        await replacement.create_indexes(indexes)
+
+    count = await collection.estimated_document_count()
+    await replacement.rename(collection.name, dropTarget=True)
+    logger.info("Swapped in an empty %s collection, dropping ~%s todos", collection.name, count)
+    return count
+
+
+__all__ = ["PurgeResult", "purge_todos"]
@@ -0,0 +1,163 @@
+"""
+Per-user todo counters kept in the user_stats collection.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from pymongo import UpdateOne
+
+from ..core.cache import todo_cache
+from ..models_beanie import Todo, UserStats
+
+logger = logging.getLogger(__name__)
+
+
+def _count_stages(match: Dict) -> List[Dict]:
+    return [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": "$owner_id",
+                "total": {"$sum": 1},
+                "completed": {"$sum": {"$cond": ["$complete", 1, 0]}},
+            }
+        },
+    ]
+
+
+async def apply_delta(owner_id: str, total: int = 0, completed: int = 0) -> None:
+    """
+    Record a write to a user's todos: adjust the counters, bump the list
+    version and drop the user's cached pages.
+
+    The counters are a separate document, so a crash between the todo write
+    and this $inc can leave them off by one until the next reconciliation.
+    """
+    await UserStats.get_motor_collection().update_one(
+        {"_id": owner_id},
+        {"$inc": {"total": total, "completed": completed, "list_version": 1}},
+        upsert=True,
+    )
+    await todo_cache.invalidate(owner_id)
+
+
+async def get_list_version(owner_id: str) -> int:
+    """A user's list version, which changes whenever any of their todos does."""
+    stats = await UserStats.get_motor_collection().find_one(
+        {"_id": owner_id}, {"list_version": 1}
+    )
+    return (stats or {}).get("list_version", 0)
+
+
+async def get_stats(owner_id: str) -> Dict[str, int]:
+    """
+    Read a user's counters with one _id lookup.
+
+    Users whose counters were never rebuilt (e.g. created before the
+    counters existed) are reconciled first.
+
+    Returns:
+        Dict with total, completed and pending
+    """
+    collection = UserStats.get_motor_collection()
+    stats = await collection.find_one({"_id": owner_id})
+    if stats is None or stats.get("reconciled_at") is None:
+        await reconcile_stats([owner_id])
+        stats = await collection.find_one({"_id": owner_id}) or {}
+
+    total = max(stats.get("total", 0), 0)
+    completed = min(max(stats.get("completed", 0), 0), total)
+    return {"total": total, "completed": completed, "pending": total - completed}
+
+
+async def reconcile_stats(owner_ids: Optional[Sequence[str]] = None) -> None:
+    """
+    Rebuild counters from the todos with one grouped aggregation.
+
+    Without `owner_ids` every user is rebuilt: the counts are $merged into
+    user_stats and counters of users left without todos are zeroed.
+
+    Args:
+        owner_ids: Only rebuild these users
+    """
+    started = datetime.utcnow()
+    collection = UserStats.get_motor_collection()
+
+    if owner_ids is not None:
+        owner_ids = list(owner_ids)
+        if not owner_ids:
+            return
+        cursor = Todo.get_motor_collection().aggregate(
+            _count_stages({"owner_id": {"$in": owner_ids}})
+        )
+        counts = {row["_id"]: row async for row in cursor}
+        await collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": owner_id},
+                    {
+                        "$set": {
+                            "total": counts.get(owner_id, {}).get("total", 0),
+                            "completed": counts.get(owner_id, {}).get("completed", 0),
+                            "reconciled_at": started,
+                        },
+                        "$inc": {"list_version": 1},
+                    },
+                    upsert=True,
+                )
+                for owner_id in owner_ids
+            ],
+            ordered=False,
+        )
+        for owner_id in owner_ids:
+            await todo_cache.invalidate(owner_id)
+        return
+
+    pipeline = _count_stages({}) + [
+        {"$set": {"reconciled_at": {"$literal": started}}},
+        {
+            "$merge": {
+                "into": UserStats.get_collection_name(),
+                "on": "_id",
+                # Bump the list version only where the counts were off.
+                "whenMatched": [
+                    {
+                        "$set": {
+                            "list_version": {
+                                "$cond": [
+                                    {
+                                        "$and": [
+                                            {"$eq": ["$total", "$$new.total"]},
+                                            {"$eq": ["$completed", "$$new.completed"]},
+                                        ]
+                                    },
+                                    "$list_version",
+                                    {"$add": [{"$ifNull": ["$list_version", 0]}, 1]},
+                                ]
+                            },
+                            "total": "$$new.total",
+                            "completed": "$$new.completed",
+                            "reconciled_at": "$$new.reconciled_at",
+                        }
+                    }
+                ],
+                "whenNotMatched": "insert",
+            }
+        },
+    ]
+    await Todo.get_motor_collection().aggregate(pipeline, allowDiskUse=True).to_list(None)
+    # Counters the merge did not touch belong to users without todos.
+    emptied = await collection.update_many(
+        {
+            "reconciled_at": {"$lt": started},
+            "$or": [{"total": {"$ne": 0}}, {"completed": {"$ne": 0}}],
+        },
+        {"$set": {"total": 0, "completed": 0, "reconciled_at": started}, "$inc": {"list_version": 1}},
+    )
+    logger.info("Reconciled user stats (%s users without todos)", emptied.modified_count)
+
+
+__all__ = ["apply_delta", "get_list_version", "get_stats", "reconcile_stats"]
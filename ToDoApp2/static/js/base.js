@@ -128,8 +128,56 @@ document.addEventListener('DOMContentLoaded', function () {
 
     }
 
+    // Load More Todos JS
+    const loadMoreButton = document.getElementById('loadMoreTodos');
+    if (loadMoreButton) {
+        loadMoreButton.addEventListener('click', async function () {
+            const cursor = loadMoreButton.dataset.cursor;
+            const offset = parseInt(loadMoreButton.dataset.offset);
+            loadMoreButton.disabled = true;
+
+            try {
+                const response = await fetch(
+                    `/todos/todo-page/rows?cursor=${encodeURIComponent(cursor)}&offset=${offset}`,
+                    { redirect: 'manual' }
+                );
+
+                if (!response.ok) {
+                    window.location.href = '/auth/login-page';
+                    return;
+                }
+
+                const html = await response.text();
+                const rows = document.getElementById('todoRows');
+                rows.insertAdjacentHTML('beforeend', html);
+
+                const nextCursor = response.headers.get('X-Next-Cursor');
+                if (nextCursor) {
+                    loadMoreButton.dataset.cursor = nextCursor;
+                    loadMoreButton.dataset.offset = rows.querySelectorAll('tr').length;
+                    loadMoreButton.disabled = false;
+                } else {
+                    loadMoreButton.remove();
+                }
+            } catch (error) {
+                console.error('Error:', error);
+                loadMoreButton.disabled = false;
+                alert('An error occurred. Please try again.');
+            }
+        });
+    }
+
     // Login JS
     const loginForm = document.getElementById('loginForm');
+    if (loginForm) {
+        // Resume the session without a password if the (HttpOnly) refresh
+        // token cookie is still valid
+        refreshSession().then(function (refreshed) {
+            if (refreshed) {
+                window.location.href = '/todos/todo-page';
+            }
+        });
+    }
     if (loginForm) {
         console.log('Login form found, attaching listener');
         loginForm.addEventListener('submit', async function (event) {
@@ -158,7 +206,7 @@ document.addEventListener('DOMContentLoaded', function () {
                     const data = await response.json();
                     // Delete any cookies available
                     clearCookies();
-                    // Save token to cookie
+                    // Save the access token; the server set the refresh token cookie
                     document.cookie = `access_token=${data.access_token}; path=/`;
                     window.location.href = '/todos/todo-page'; // Change this to your desired redirect page
                 } else {
@@ -194,7 +242,8 @@ document.addEventListener('DOMContentLoaded', function () {
                 firstname: data.firstname,
                 lastname: data.lastname,
                 role: data.role,
-                password: data.password
+                password: data.password,
+                timezone: Intl.DateTimeFormat().resolvedOptions().timeZone
             };
 
             try {
@@ -259,6 +308,22 @@ function getCookie(name) {
     return cookieValue;
 };
 
+// Exchange the refresh token cookie for a new access token
+async function refreshSession() {
+    try {
+        const response = await fetch('/auth/refresh', { method: 'POST' });
+        if (!response.ok) {
+            return false;
+        }
+        const data = await response.json();
+        document.cookie = `access_token=${data.access_token}; path=/`;
+        return true;
+    } catch (error) {
+        console.error('Error:', error);
+        return false;
+    }
+}
+
 function clearCookies() {
     // Get all cookies
     const cookies = document.cookie.split(";");
@@ -273,7 +338,9 @@ function clearCookies() {
     }
 }
 
-function logout() {
+async function logout() {
+    // The server revokes the session and drops the HttpOnly refresh cookie
+    await fetch('/auth/logout', { method: 'POST', redirect: 'manual' });
     clearCookies();
     // Redirect to the login page
     window.location.href = '/auth/login-page';
@@ -0,0 +1,84 @@
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from ..database import DOCUMENT_MODELS
+from ..models_beanie import DECLARED_INDEXES, Todo, User
+
+
+@pytest.fixture
+def user():
+    """The current user as get_current_user returns it."""
+    return {'id': 'owner', 'username': 'owner', 'user_role': 'user'}
+
+
+@pytest_asyncio.fixture
+async def db():
+    """A fresh in-memory database with every document model initialised."""
+    database = AsyncMongoMockClient()['test']
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    return database
+
+
+@pytest_asyncio.fixture
+async def mongo_db():
+    """
+    A throwaway database on a real server, for pipelines mongomock lacks
+    ($merge). Skipped unless TEST_MONGODB_URL is set.
+    """
+    url = os.getenv('TEST_MONGODB_URL')
+    if not url:
+        pytest.skip('TEST_MONGODB_URL is not set')
+    client = AsyncIOMotorClient(url)
+    database = client[f'todoapp_test_{uuid.uuid4().hex[:8]}']
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    for model, indexes in DECLARED_INDEXES.items():
+        if indexes:
+            await model.get_motor_collection().create_indexes(indexes)
+    yield database
+    await client.drop_database(database.name)
+    client.close()
+
+
+@pytest.fixture
+def make_todo(db, user):
+    """Insert a todo owned by the current user; keyword arguments override fields."""
+
+    async def make(**fields) -> Todo:
+        todo = Todo(**{
+            'title': 'write tests',
+            'description': 'for todos',
+            'priority': 1,
+            'owner_id': user['id'],
+            **fields,
+        })
+        await todo.insert()
+        return todo
+
+    return make
+
+
+@pytest.fixture
+def make_user(db):
+    """Insert a user; keyword arguments override fields."""
+
+    async def make(**fields) -> User:
+        username = fields.pop('username', 'alice')
+        user = User(**{
+            'email': f'{username}@example.com',
+            'username': username,
+            'first_name': 'Alice',
+            'last_name': 'Example',
+            'hashed_password': 'not-a-hash',
+            'role': 'user',
+            **fields,
+        })
+        await user.insert()
+        return user
+
+    return make
@@ -0,0 +1,54 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ..core.static import IMMUTABLE, PrecompressedStaticFiles
+from ..tools.assets import build_assets
+
+CSS = b".card { color: red; }\n" * 200
+
+
+def _build(tmp_path):
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "site.css").write_bytes(CSS)
+    manifest = build_assets(source)
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=str(source)), name="static")
+    return manifest, TestClient(app)
+
+
+def test_build_hashes_names_and_writes_compressed_siblings(tmp_path):
+    manifest, _ = _build(tmp_path)
+
+    hashed = manifest["css/site.css"]
+    assert hashed.startswith("css/site.") and hashed.endswith(".css")
+    dist = tmp_path / "static" / "dist"
+    assert gzip.decompress((dist / (hashed + ".gz")).read_bytes()) == CSS
+    assert (dist / "manifest.json").exists()
+
+
+def test_hashed_asset_served_precompressed_and_immutable(tmp_path):
+    manifest, client = _build(tmp_path)
+    url = "/static/dist/" + manifest["css/site.css"]
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/css")
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == CSS
+
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.content == CSS
+
+
+def test_unhashed_asset_is_revalidated(tmp_path):
+    _, client = _build(tmp_path)
+
+    response = client.get("/static/css/site.css")
+
+    assert response.headers["cache-control"] == "no-cache"
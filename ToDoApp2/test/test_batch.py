@@ -0,0 +1,106 @@
+import pytest
+
+from ..models_beanie import Todo
+from ..routers.todos import batch_todos
+from ..schemas.todo import TodoBatchRequest
+from ..services import stats as stats_service
+
+
+def _batch(*operations) -> TodoBatchRequest:
+    return TodoBatchRequest(operations=list(operations))
+
+
+def _todo(**fields):
+    return {'title': 'batched', 'description': 'in a batch', 'priority': 3, **fields}
+
+
+def _statuses(response):
+    return [result.status for result in response['results']]
+
+
+@pytest.mark.asyncio
+async def test_operations_apply_and_counters_follow(make_todo, user):
+    kept = await make_todo()
+    done = await make_todo()
+    gone = await make_todo(complete=True)
+
+    response = await batch_todos(user, _batch(
+        {'op': 'create', 'todo': _todo(complete=True)},
+        {'op': 'update', 'id': str(kept.id), 'todo': _todo(title='renamed')},
+        {'op': 'complete', 'id': str(done.id)},
+        {'op': 'delete', 'id': str(gone.id)},
+    ))
+
+    assert _statuses(response) == ['created', 'updated', 'updated', 'deleted']
+    assert (await Todo.get(kept.id)).title == 'renamed'
+    assert (await Todo.get(done.id)).complete
+    assert await Todo.get(gone.id) is None
+    assert (await stats_service.get_stats(user['id']))['completed'] == 2
+    await stats_service.reconcile_stats([user['id']])
+    assert await stats_service.get_stats(user['id']) == {'total': 3, 'completed': 2, 'pending': 1}
+
+
+@pytest.mark.asyncio
+async def test_other_owners_and_unknown_ids_are_not_found(make_todo, user):
+    foreign = await make_todo(owner_id='someone-else')
+
+    response = await batch_todos(user, _batch(
+        {'op': 'delete', 'id': str(foreign.id)},
+        {'op': 'complete', 'id': 'not-an-id'},
+    ))
+
+    assert _statuses(response) == ['not_found', 'not_found']
+    assert await Todo.get(foreign.id) is not None
+
+
+@pytest.mark.asyncio
+async def test_duplicate_ids_run_only_the_first_operation(make_todo, user):
+    todo = await make_todo()
+
+    response = await batch_todos(user, _batch(
+        {'op': 'complete', 'id': str(todo.id)},
+        {'op': 'delete', 'id': str(todo.id)},
+    ))
+
+    assert _statuses(response) == ['updated', 'error']
+    assert (await Todo.get(todo.id)).complete
+
+
+@pytest.mark.asyncio
+async def test_update_with_a_stale_version_is_a_conflict(make_todo, user):
+    todo = await make_todo(version=2)
+
+    response = await batch_todos(user, _batch(
+        {'op': 'update', 'id': str(todo.id), 'todo': _todo(title='renamed', version=1)},
+    ))
+
+    assert _statuses(response) == ['conflict']
+    assert (await Todo.get(todo.id)).version == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_attributed_per_todo(make_todo, user, monkeypatch):
+    bumped = await make_todo()
+    applied = await make_todo()
+    removed = await make_todo()
+    collection = Todo.get_motor_collection()
+    bulk_write = collection.bulk_write
+
+    async def racing_bulk_write(requests, **kwargs):
+        # Another request writes `bumped` and deletes `removed` after the
+        # batch read them but before its writes land.
+        await collection.update_one({'_id': bumped.id}, {'$inc': {'version': 1}})
+        await collection.delete_one({'_id': removed.id})
+        return await bulk_write(requests, **kwargs)
+
+    monkeypatch.setattr(collection, 'bulk_write', racing_bulk_write)
+    response = await batch_todos(user, _batch(
+        {'op': 'complete', 'id': str(bumped.id)},
+        {'op': 'complete', 'id': str(applied.id)},
+        {'op': 'update', 'id': str(removed.id), 'todo': _todo()},
+    ))
+
+    assert _statuses(response) == ['conflict', 'updated', 'not_found']
+    assert not (await Todo.get(bumped.id)).complete
+    assert (await Todo.get(applied.id)).complete
+    assert await stats_service.get_stats(user['id']) == {'total': 2, 'completed': 1, 'pending': 1}
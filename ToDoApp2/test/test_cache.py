@@ -0,0 +1,83 @@
+import pytest
+
+from ..core.cache import LRUCacheBackend, RedisCacheBackend
+
+
+@pytest.mark.asyncio
+async def test_hit_ratio_counts_lookups():
+    cache = LRUCacheBackend(max_keys=10)
+
+    assert await cache.get('owner', 'page') is None
+    await cache.set('owner', 'page', {'items': []})
+
+    assert await cache.get('owner', 'page') == {'items': []}
+    assert cache.stats()['hit_ratio'] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_only_that_owner():
+    cache = LRUCacheBackend(max_keys=10)
+    await cache.set('a', '1', 'a1')
+    await cache.set('a', '2', 'a2')
+    await cache.set('b', '1', 'b1')
+
+    await cache.invalidate('a')
+
+    assert await cache.get('a', '1') is None
+    assert await cache.get('a', '2') is None
+    assert await cache.get('b', '1') == 'b1'
+
+
+@pytest.mark.asyncio
+async def test_expired_fields_miss():
+    cache = LRUCacheBackend(max_keys=10, ttl_seconds=-1)
+    await cache.set('owner', 'page', 'value')
+
+    assert await cache.get('owner', 'page') is None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_owner_is_evicted():
+    cache = LRUCacheBackend(max_keys=2)
+    await cache.set('a', 'page', 'a')
+    await cache.set('b', 'page', 'b')
+    await cache.get('a', 'page')
+    await cache.set('c', 'page', 'c')
+
+    assert await cache.get('b', 'page') is None
+    assert await cache.get('a', 'page') == 'a'
+
+
+@pytest.mark.asyncio
+async def test_fields_per_owner_are_capped():
+    cache = LRUCacheBackend(max_keys=10, max_fields=2)
+    for version in range(5):
+        await cache.set('owner', f'{version}:50:', version)
+
+    assert await cache.get('owner', '2:50:') is None
+    assert await cache.get('owner', '3:50:') == 3
+    assert await cache.get('owner', '4:50:') == 4
+    assert len(cache._entries['owner']) == 2
+
+
+@pytest.mark.asyncio
+async def test_kill_switch_bypasses_the_cache():
+    cache = LRUCacheBackend(max_keys=10, enabled=False)
+    await cache.set('owner', 'page', 'value')
+
+    assert await cache.get('owner', 'page') is None
+    assert cache.stats()['misses'] == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_round_trip_and_invalidate():
+    fakeredis = pytest.importorskip('fakeredis')
+    cache = RedisCacheBackend(fakeredis.FakeAsyncRedis(), ttl_seconds=30)
+
+    await cache.set('owner', 'page', {'items': [{'_id': '1'}], 'next_cursor': None})
+    assert await cache.get('owner', 'page') == {'items': [{'_id': '1'}], 'next_cursor': None}
+
+    await cache.invalidate('owner')
+    assert await cache.get('owner', 'page') is None
+    assert cache.stats()['hits'] == 1
+    await cache.close()
@@ -0,0 +1,112 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from ..core.compression import CompressionMiddleware
+
+PAYLOAD = {"items": [{"title": f"todo {i}", "complete": False, "priority": 3} for i in range(100)]}
+
+
+def _app(**options):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/todos")
+    def todos():
+        return JSONResponse(PAYLOAD, headers={"ETag": '"list-1"'})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/image")
+    def image():
+        return PlainTextResponse("x" * 2000, media_type="image/svg+xml")
+
+    @app.get("/static/app.css")
+    def static():
+        return PlainTextResponse("x" * 2000, media_type="text/css")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"<li>row {i}</li>" for i in range(3)), media_type="text/html")
+
+    return app
+
+
+async def _call(app, path, accept_encoding):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "method": "GET", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "scheme": "http", "http_version": "1.1",
+        "server": ("test", 80), "client": ("test", 1),
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    return start["status"], headers, [m.get("body", b"") for m in messages[1:]]
+
+
+@pytest.mark.asyncio
+async def test_gzip_with_length_vary_and_weak_etag():
+    status, headers, chunks = await _call(_app(), "/todos", "gzip, deflate")
+
+    body = b"".join(chunks)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(body))
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["etag"] == 'W/"list-1"'
+    assert len(body) * 5 < len(gzip.decompress(body))
+
+
+@pytest.mark.asyncio
+async def test_zstd_preferred_when_available():
+    zstandard = pytest.importorskip("zstandard")
+
+    _, headers, chunks = await _call(_app(), "/todos", "gzip, zstd")
+
+    assert headers["content-encoding"] == "zstd"
+    assert b'"todo 99"' in zstandard.ZstdDecompressor().decompress(b"".join(chunks))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, accept_encoding", [
+    ("/todos", "identity"),
+    ("/todos", "gzip;q=0, zstd;q=0"),
+    ("/small", "gzip"),
+    ("/image", "gzip"),
+    ("/static/app.css", "gzip"),
+])
+async def test_left_uncompressed(path, accept_encoding):
+    app = _app(exclude_paths=["/static"], exclude_content_types=["image/"])
+
+    _, headers, _ = await _call(app, path, accept_encoding)
+
+    assert "content-encoding" not in headers
+
+
+@pytest.mark.asyncio
+async def test_stream_chunks_are_flushed_as_they_arrive():
+    _, headers, chunks = await _call(_app(gzip_level=9), "/stream", "gzip")
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # Each row decodes from its own chunk, without waiting for the end.
+    assert [decoder.decompress(chunk) for chunk in chunks[:3]] == [
+        b"<li>row 0</li>", b"<li>row 1</li>", b"<li>row 2</li>"
+    ]
+    assert decoder.decompress(chunks[-1]) + decoder.flush() == b""
+    assert decoder.eof
@@ -0,0 +1,88 @@
+import re
+
+from ..tools.css_purge import Safelist, collect_used_names, purge_css, split_selectors
+
+CSS = """
+/*! license */
+/* dropped comment */
+body { margin: 0; }
+.btn, .badge { display: inline-block; }
+.btn:not(:disabled):not(.disabled) { cursor: pointer; }
+.card > .card-body { padding: 1rem; }
+a:not([href]) { color: inherit; }
+@media (min-width: 768px) {
+  .col-md-6 { width: 50%; }
+  .col-md-4 { width: 33%; }
+}
+@media print { .d-print-none { display: none; } }
+.spinner { animation: spin 1s linear; }
+@keyframes spin { from { opacity: 0; } to { opacity: 1; } }
+@keyframes progress { from { width: 0; } }
+.content::after { content: "a, b { }"; }
+"""
+
+
+def _purge(used, safelist=None):
+    css, total, kept = purge_css(CSS, set(used), safelist)
+    return css, total, kept
+
+
+def test_unused_selectors_are_dropped_and_used_ones_kept():
+    css, total, kept = _purge({"btn", "card", "card-body", "col-md-6"})
+
+    assert ".btn{display:inline-block}" in css
+    assert "badge" not in css
+    assert ".card>.card-body{padding:1rem}" in css
+    assert "@media (min-width:768px){.col-md-6{width:50%}}" in css
+    assert "col-md-4" not in css
+    assert "@media print" not in css
+    assert (total, kept) == (11, 6)
+
+
+def test_classes_under_not_and_element_selectors_do_not_need_to_be_used():
+    css, _, _ = _purge({"btn"})
+
+    assert ".btn:not(:disabled):not(.disabled){cursor:pointer}" in css
+    assert "body{margin:0}" in css
+    assert "a:not([href]){color:inherit}" in css
+
+
+def test_license_kept_comments_dropped_and_strings_untouched():
+    css, _, _ = _purge({"content"})
+
+    assert css.startswith("/*! license */")
+    assert "dropped comment" not in css
+    assert '.content::after{content:"a, b { }"}' in css
+
+
+def test_keyframes_kept_only_when_referenced():
+    css, _, _ = _purge({"spinner"})
+
+    assert re.search(r"@keyframes spin\{from\{opacity:0\}to\{opacity:1\}\}", css)
+    assert "progress" not in css
+    assert "@keyframes spin" not in _purge(set())[0]
+
+
+def test_safelist_names_and_patterns():
+    safelist = Safelist({"badge"}, [re.compile(r"^col-md-")])
+    css, _, _ = _purge(set(), safelist)
+
+    assert ".badge{display:inline-block}" in css
+    assert ".col-md-4{width:33%}" in css
+
+
+def test_split_selectors_ignores_nested_commas():
+    assert split_selectors('a, .x:not(.a, .b), [title="a,b"]') == [
+        "a", ".x:not(.a, .b)", '[title="a,b"]'
+    ]
+
+
+def test_collect_used_names_reads_templates_and_scripts(tmp_path):
+    (tmp_path / "page.html").write_text('<div class="card {{ \'active\' if on }}"></div>')
+    (tmp_path / "app.js").write_text("el.className = 'alert alert-danger';")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    used = collect_used_names([tmp_path])
+
+    assert {"card", "active", "alert", "alert-danger"} <= used
+    assert "ignored" not in used
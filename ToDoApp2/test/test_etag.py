@@ -0,0 +1,51 @@
+import pytest
+from fastapi import Response
+
+from ..routers.todos import _etag_matches, _list_etag, read_all, read_todo
+from ..services import stats as stats_service
+
+
+def test_etag_matches_is_a_weak_comparison():
+    assert _etag_matches('"3"', 'W/"3"')
+    assert _etag_matches('W/"3"', '"3"')
+    assert _etag_matches('"1", W/"3"', 'W/"3"')
+    assert _etag_matches('*', 'W/"3"')
+
+
+def test_etag_matches_rejects_stale_and_missing_tags():
+    assert not _etag_matches(None, 'W/"3"')
+    assert not _etag_matches('', 'W/"3"')
+    assert not _etag_matches('W/"2"', 'W/"3"')
+    assert not _etag_matches('"30"', 'W/"3"')
+
+
+def test_list_etag_never_matches_a_todo_version():
+    assert not _etag_matches(_list_etag(3), 'W/"3"')
+
+
+@pytest.mark.asyncio
+async def test_current_tag_is_304_and_stale_tag_is_200(make_todo, user):
+    todo = await make_todo(version=3)
+
+    not_modified = await read_todo(user, Response(), str(todo.id), if_none_match='W/"3"')
+    assert not_modified.status_code == 304
+    assert not_modified.headers['ETag'] == 'W/"3"'
+
+    response = Response()
+    fresh = await read_todo(user, response, str(todo.id), if_none_match='W/"2"')
+    assert fresh.id == todo.id
+    assert response.headers['ETag'] == 'W/"3"'
+
+
+@pytest.mark.asyncio
+async def test_list_tag_goes_stale_after_a_write(make_todo, user):
+    await make_todo()
+    etag = _list_etag(await stats_service.get_list_version('owner'))
+
+    assert (await read_all(user, cursor=None, limit=None, if_none_match=etag)).status_code == 304
+
+    await stats_service.apply_delta('owner', total=1)
+    response = await read_all(user, cursor=None, limit=None, if_none_match=etag)
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
@@ -0,0 +1,69 @@
+from datetime import date, datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from ..core.dependencies import get_current_user
+from ..models_beanie import Todo, TodoHistory
+from ..routers import todos
+from ..services.history import archive_todos, fetch_history_page
+
+DAY = datetime(2025, 3, 10)
+
+
+async def _buckets(owner_id: str, days: int):
+    for offset in range(days):
+        await TodoHistory(owner_id=owner_id, day=DAY - timedelta(days=offset), total=offset).insert()
+
+
+@pytest.mark.asyncio
+async def test_history_pages_newest_day_first(db, user):
+    await _buckets(user['id'], 5)
+    await _buckets('someone-else', 2)
+
+    first, cursor = await fetch_history_page(user['id'], None, 2)
+    second, cursor = await fetch_history_page(user['id'], cursor, 2)
+    last, end = await fetch_history_page(user['id'], cursor, 2)
+
+    assert [bucket.day for bucket in first + second + last] == [DAY - timedelta(days=n) for n in range(5)]
+    assert len(last) == 1
+    assert end is None
+
+
+@pytest.mark.asyncio
+async def test_history_endpoint_returns_pages_of_the_current_user(db, user):
+    await _buckets(user['id'], 3)
+    await _buckets('someone-else', 3)
+    app = FastAPI()
+    app.include_router(todos.router)
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        first = (await client.get('/todos/history', params={'limit': 2})).json()
+        params = {'limit': 2, 'cursor': first['next_cursor']}
+        rest = (await client.get('/todos/history', params=params)).json()
+
+    assert [item['total'] for item in first['items'] + rest['items']] == [0, 1, 2]
+    assert {item['owner_id'] for item in first['items'] + rest['items']} == {user['id']}
+    assert rest['next_cursor'] is None
+
+
+@pytest.mark.asyncio
+async def test_archive_merges_reruns_without_duplicates(mongo_db, user):
+    # $merge is not supported by mongomock, so this runs against a real
+    # server only (see the mongo_db fixture).
+    async def add(title, complete=False):
+        todo = Todo(title=title, description='archived', priority=1, complete=complete, owner_id=user['id'])
+        await todo.insert()
+
+    await add('first', complete=True)
+    await archive_todos({'owner_id': user['id']}, date(2025, 3, 10))
+    await add('second')
+    await archive_todos({'owner_id': user['id']}, date(2025, 3, 10))
+
+    buckets = await TodoHistory.find({'owner_id': user['id']}).to_list()
+    assert len(buckets) == 1
+    assert [todo.title for todo in buckets[0].todos] == ['first', 'second']
+    assert (buckets[0].total, buckets[0].completed) == (2, 1)
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from ..config import settings
+from ..models_beanie import JobLease
+from ..services.leases import LeaderLease, run_exclusive
+
+
+async def _lease(key: str):
+    return await JobLease.get_motor_collection().find_one({'_id': key})
+
+
+@pytest.mark.asyncio
+async def test_second_holder_is_refused(db):
+    first = LeaderLease('job:run', owner='a')
+    second = LeaderLease('job:run', owner='b')
+
+    assert await first.try_acquire()
+    assert not await second.try_acquire()
+    assert await first.try_acquire()
+    assert (await _lease('job:run'))['owner'] == 'a'
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_taken_over_and_old_holder_loses_it(db):
+    dead = LeaderLease('job:run', ttl_seconds=-1, owner='a')
+    live = LeaderLease('job:run', owner='b')
+
+    assert await dead.try_acquire()
+    assert await live.try_acquire()
+    assert not await dead.renew()
+    assert await live.renew()
+
+
+@pytest.mark.asyncio
+async def test_completed_run_is_not_repeated(db):
+    first = LeaderLease('job:run', ttl_seconds=-1, owner='a')
+    assert await first.try_acquire()
+    await first.complete()
+
+    assert not await LeaderLease('job:run', owner='b').try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_successful_run_marks_the_lease_done(db):
+    ran = []
+
+    async def job():
+        ran.append(True)
+
+    assert await run_exclusive('job', job, run_key='run')
+    assert ran == [True]
+    assert (await _lease('job:run'))['status'] == 'done'
+
+
+@pytest.mark.asyncio
+async def test_failed_run_is_recorded_and_not_taken_over(db):
+
+    async def job():
+        raise RuntimeError('boom')
+
+    assert await run_exclusive('job', job, run_key='run')
+    assert (await _lease('job:run'))['status'] == 'failed'
+    assert not await LeaderLease('job:run', owner='b').try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_waiting_process_stops_when_the_holder_fails(db, monkeypatch):
+    monkeypatch.setattr(settings, 'job_lease_ttl_seconds', 0.03)
+    holder = LeaderLease('job:run', owner='other')
+    assert await holder.try_acquire()
+    ran = []
+
+    async def job():
+        ran.append(True)
+
+    waiting = asyncio.create_task(run_exclusive('job', job, run_key='run'))
+    await asyncio.sleep(0.02)
+    await holder.fail()
+
+    assert not await waiting
+    assert ran == []
+    assert await run_exclusive('job', job, run_key='next-run')
+    assert ran == [True]
+
+
+@pytest.mark.asyncio
+async def test_waiting_process_skips_a_run_finished_elsewhere(db, monkeypatch):
+    monkeypatch.setattr(settings, 'job_lease_ttl_seconds', 0.03)
+    other = LeaderLease('job:run', owner='other')
+    assert await other.try_acquire()
+    await other.complete()
+    ran = []
+
+    async def job():
+        ran.append(True)
+
+    assert not await run_exclusive('job', job, run_key='run')
+    assert ran == []
+
+
+@pytest.mark.asyncio
+async def test_repeating_job_skips_while_held_and_releases_after_a_run(db):
+    ran = []
+
+    async def job():
+        ran.append(True)
+
+    holder = LeaderLease('job:active', owner='other')
+    assert await holder.try_acquire()
+    assert not await run_exclusive('job', job, repeating=True)
+    assert ran == []
+
+    await holder.release()
+    assert await run_exclusive('job', job, repeating=True)
+    assert ran == [True]
+    assert await _lease('job:active') is None
+
+
+@pytest.mark.asyncio
+async def test_failed_repeating_job_is_retried_on_the_next_firing(db):
+    attempts = []
+
+    async def job():
+        attempts.append(True)
+        if len(attempts) == 1:
+            raise RuntimeError('boom')
+
+    assert await run_exclusive('job', job, repeating=True)
+    assert await run_exclusive('job', job, repeating=True)
+    assert len(attempts) == 2
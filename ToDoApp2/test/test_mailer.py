@@ -0,0 +1,78 @@
+import socket
+from email.message import EmailMessage
+
+import pytest
+
+from ..services.mailer import SMTPMailer
+
+aiosmtpd_controller = pytest.importorskip('aiosmtpd.controller')
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.sessions.add(id(session))
+        return '250 OK'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname='127.0.0.1', port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def _message(recipient):
+    message = EmailMessage()
+    message['From'] = 'bot@todos.com'
+    message['To'] = recipient
+    message['Subject'] = 'Summary'
+    message.set_content('hello')
+    return message
+
+
+@pytest.mark.asyncio
+async def test_send_many_reuses_pooled_connections(smtp_server):
+    controller, handler = smtp_server
+    mailer = SMTPMailer(
+        controller.hostname, controller.port,
+        use_tls=False, pool_size=2
+    )
+
+    errors = await mailer.send_many([_message(f'user{i}@todos.com') for i in range(10)])
+    await mailer.close()
+
+    assert errors == [None] * 10
+    assert len(handler.messages) == 10
+    assert len(handler.sessions) <= 2
+    assert mailer.stats()['sent'] == 10
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_dropped_connection(smtp_server):
+    controller, handler = smtp_server
+    mailer = SMTPMailer(
+        controller.hostname, controller.port,
+        use_tls=False, pool_size=1
+    )
+
+    await mailer.send(_message('first@todos.com'))
+    # Simulate the server hanging up an idle session.
+    mailer._connections[0].server.sock.shutdown(socket.SHUT_RDWR)
+    await mailer.send(_message('second@todos.com'))
+    await mailer.close()
+
+    assert len(handler.messages) == 2
+    assert mailer.stats()['reconnects'] == 1
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from ..core.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678000)
+    object_id = ObjectId()
+
+    cursor = encode_cursor(created_at, object_id)
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (created_at, object_id)
+
+
+def test_keyset_filter_first_page():
+    assert keyset_filter(None) == {}
+
+
+def test_keyset_filter_after_cursor():
+    created_at = datetime(2025, 1, 2)
+    object_id = ObjectId()
+
+    query = keyset_filter(encode_cursor(created_at, object_id))
+
+    assert query == {
+        '$or': [
+            {'created_at': {'$lt': created_at}},
+            {'created_at': created_at, '_id': {'$lt': object_id}},
+        ]
+    }
+
+
+def test_invalid_cursor():
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor('not-a-cursor')
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == 'Invalid cursor'
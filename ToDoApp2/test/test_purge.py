@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from ..config import settings
+from ..models_beanie import Todo
+from ..services import notifications
+from ..services.purge import purge_todos
+
+
+def _old_id(n: int) -> ObjectId:
+    """An _id from an hour ago, so it sorts before the purge cutoff."""
+    timestamp = str(ObjectId.from_datetime(datetime.utcnow() - timedelta(hours=1)))[:8]
+    return ObjectId(f'{timestamp}{n:016x}')
+
+
+async def _insert_old(count: int, owner_id: str = 'owner'):
+    await Todo.get_motor_collection().insert_many(
+        [{'_id': _old_id(n), 'title': f'todo {n}', 'owner_id': owner_id} for n in range(count)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_batched_purge_deletes_in_id_ranges(db):
+    await _insert_old(7)
+
+    result = await purge_todos(mode='batched', batch_size=3, pause_ms=0, dry_run=False)
+
+    assert (result.matched, result.deleted, result.batches) == (7, 7, 3)
+    assert await Todo.get_motor_collection().count_documents({}) == 0
+
+
+@pytest.mark.asyncio
+async def test_exact_multiple_of_batch_size_stops_on_an_empty_batch(db):
+    await _insert_old(6)
+
+    result = await purge_todos(mode='batched', batch_size=3, pause_ms=0, dry_run=False)
+
+    assert (result.deleted, result.batches) == (6, 2)
+
+
+@pytest.mark.asyncio
+async def test_filter_and_cutoff_limit_what_is_deleted(db):
+    await _insert_old(4)
+    collection = Todo.get_motor_collection()
+    await collection.insert_one({'_id': _old_id(99), 'title': 'kept', 'owner_id': 'other'})
+    newer = ObjectId.from_datetime(datetime.utcnow() + timedelta(minutes=1))
+    await collection.insert_one({'_id': newer, 'title': 'added during the purge', 'owner_id': 'owner'})
+
+    result = await purge_todos({'owner_id': 'owner'}, batch_size=3, pause_ms=0, dry_run=False)
+
+    assert result.deleted == 4
+    assert await collection.count_documents({}) == 2
+
+
+@pytest.mark.asyncio
+async def test_dry_run_only_counts(db):
+    await _insert_old(5)
+
+    result = await purge_todos(mode='batched', batch_size=2, dry_run=True)
+
+    assert (result.matched, result.deleted, result.batches) == (5, 0, 0)
+    assert await Todo.get_motor_collection().count_documents({}) == 5
+
+
+@pytest.mark.asyncio
+async def test_swap_with_a_filter_falls_back_to_batched(db):
+    await _insert_old(2)
+
+    result = await purge_todos({'owner_id': 'owner'}, mode='swap', pause_ms=0, dry_run=False)
+
+    assert (result.mode, result.deleted) == ('batched', 2)
+
+
+@pytest.mark.asyncio
+async def test_swap_replaces_the_whole_collection(db):
+    await _insert_old(3)
+
+    result = await purge_todos(mode='swap', dry_run=False)
+
+    assert (result.mode, result.deleted, result.batches) == ('swap', 3, 1)
+    assert await Todo.get_motor_collection().count_documents({}) == 0
+
+
+@pytest.mark.asyncio
+async def test_global_reset_runs_swap_when_configured(db, monkeypatch):
+    await _insert_old(2)
+    modes = []
+
+    async def reconcile_stats(owner_ids=None):
+        pass
+
+    async def recording_purge(filter=None, mode=None, **kwargs):
+        result = await purge_todos(filter, mode=mode, dry_run=False, **kwargs)
+        modes.append(result.mode)
+        return result
+
+    monkeypatch.setattr(settings, 'daily_reset_enabled', True)
+    monkeypatch.setattr(settings, 'summary_email_enabled', False)
+    monkeypatch.setattr(settings, 'archive_enabled', False)
+    monkeypatch.setattr(settings, 'purge_mode', 'swap')
+    monkeypatch.setattr(notifications, 'purge_todos', recording_purge)
+    monkeypatch.setattr(notifications, 'reconcile_stats', reconcile_stats)
+
+    await notifications.send_daily_summaries_and_reset()
+
+    assert modes == ['swap']
+    assert await Todo.get_motor_collection().count_documents({}) == 0
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from ..core.security import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_round_trip():
+    hasher = PasswordHasher(max_workers=2, max_queue=2)
+
+    hashed = await hasher.hash('testpassword')
+
+    assert await hasher.verify('testpassword', hashed) is True
+    assert await hasher.verify('wrongpassword', hashed) is False
+    stats = hasher.stats()
+    assert stats['completed'] == 3
+    assert stats['queue_depth'] == 0
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_queue_full():
+    hasher = PasswordHasher(max_workers=1, max_queue=0, retry_after=7)
+
+    results = await asyncio.gather(
+        hasher.hash('first'), hasher.hash('second'), return_exceptions=True
+    )
+
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], PasswordHasherBusy)
+    assert results[1].retry_after == 7
+    assert hasher.stats()['rejected'] == 1
+    hasher.shutdown()
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from ..core.security import decode_token, password_hasher
+from ..models_beanie import Session, User
+from ..routers import auth
+from ..routers.auth import REFRESH_COOKIE
+from ..services.auth import (
+    create_session,
+    get_credentials,
+    refresh_session,
+    revoke_session,
+    revoke_user_sessions,
+)
+
+PASSWORD = 'pw123456'
+
+
+async def _session(make_user, **fields):
+    user = await make_user(**fields)
+    return user, await create_session(await get_credentials(user.username))
+
+
+async def _revoked(user: User):
+    sessions = Session.get_motor_collection().find({'user_id': str(user.id)})
+    return [session.get('revoked_at') is not None async for session in sessions]
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_the_token(make_user):
+    _, first = await _session(make_user)
+
+    access_token, second = await refresh_session(first)
+
+    assert decode_token(access_token)['sub'] == 'alice'
+    assert second != first
+    assert await refresh_session(first) is None
+    assert await refresh_session(second) is not None
+
+
+@pytest.mark.asyncio
+async def test_expired_session_is_rejected(make_user):
+    user, refresh_token = await _session(make_user)
+    await Session.get_motor_collection().update_one(
+        {'user_id': str(user.id)}, {'$set': {'expires_at': datetime.utcnow() - timedelta(seconds=1)}}
+    )
+
+    assert await refresh_session(refresh_token) is None
+
+
+@pytest.mark.asyncio
+async def test_revoked_sessions_are_rejected(make_user):
+    user, refresh_token = await _session(make_user)
+    other = await create_session(await get_credentials(user.username))
+
+    await revoke_session(refresh_token)
+    assert await refresh_session(refresh_token) is None
+    assert await refresh_session(other) is not None
+
+    await revoke_user_sessions(str(user.id))
+    assert await _revoked(user) == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_inactive_user_is_revoked_on_refresh(make_user):
+    user, refresh_token = await _session(make_user)
+    await create_session(await get_credentials(user.username))
+    await User.get_motor_collection().update_one({'_id': user.id}, {'$set': {'is_active': False}})
+
+    assert await refresh_session(refresh_token) is None
+    assert await _revoked(user) == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_cannot_refresh(make_user):
+    user, refresh_token = await _session(make_user)
+    await user.delete()
+
+    assert await refresh_session(refresh_token) is None
+
+
+@pytest.mark.asyncio
+async def test_refreshed_token_carries_the_current_role(make_user):
+    user, refresh_token = await _session(make_user)
+    await User.get_motor_collection().update_one({'_id': user.id}, {'$set': {'role': 'admin'}})
+
+    access_token, _ = await refresh_session(refresh_token)
+
+    assert decode_token(access_token)['role'] == 'admin'
+
+
+def _client() -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(auth.router)
+    # The refresh cookie is Secure, so it is only sent back over https.
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='https://test')
+
+
+async def _login(client: httpx.AsyncClient):
+    return await client.post('/auth/token', data={'username': 'alice', 'password': PASSWORD})
+
+
+@pytest.mark.asyncio
+async def test_login_sets_an_httponly_refresh_cookie(make_user):
+    await make_user(hashed_password=await password_hasher.hash(PASSWORD))
+
+    async with _client() as client:
+        response = await _login(client)
+
+    assert response.status_code == 200
+    assert 'refresh_token' not in response.json()
+    cookie = response.headers['set-cookie'].lower()
+    assert cookie.startswith(f'{REFRESH_COOKIE}=')
+    for attribute in ('httponly', 'secure', 'samesite=strict', 'path=/auth'):
+        assert attribute in cookie
+
+
+@pytest.mark.asyncio
+async def test_refresh_endpoint_rotates_and_rejects_replays(make_user):
+    await make_user(hashed_password=await password_hasher.hash(PASSWORD))
+
+    async with _client() as client:
+        await _login(client)
+        first = client.cookies[REFRESH_COOKIE]
+
+        response = await client.post('/auth/refresh')
+        assert response.status_code == 200
+        assert 'access_token' in response.json()
+        assert client.cookies[REFRESH_COOKIE] != first
+
+        client.cookies.clear()
+        client.cookies.set(REFRESH_COOKIE, first)
+        assert (await client.post('/auth/refresh')).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_the_session(make_user):
+    user = await make_user(hashed_password=await password_hasher.hash(PASSWORD))
+
+    async with _client() as client:
+        await _login(client)
+        refresh_token = client.cookies[REFRESH_COOKIE]
+
+        response = await client.post('/auth/logout')
+
+    assert response.status_code == 302
+    assert await _revoked(user) == [True]
+    assert await refresh_session(refresh_token) is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_without_a_cookie_is_401(db):
+    async with _client() as client:
+        assert (await client.post('/auth/refresh')).status_code == 401
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from ..models_beanie import Todo
+from ..services.notifications import _summary_stages, iter_user_summaries
+
+CUTOFF = datetime(2025, 3, 10)
+
+
+def test_stages_match_the_owners_and_the_cutoff():
+    match = _summary_stages(['a', 'b'], CUTOFF)[0]['$match']
+
+    assert match == {'owner_id': {'$in': ['a', 'b']}, 'created_at': {'$lt': CUTOFF}}
+    assert _summary_stages()[0]['$match'] == {}
+
+
+@pytest.mark.asyncio
+async def test_summaries_cover_users_without_todos_and_respect_the_cutoff(mongo_db, make_user):
+    # The $lookup uses let/$convert, which mongomock does not implement, so
+    # this runs against a real server only (see the mongo_db fixture).
+    busy = await make_user(username='busy')
+    idle = await make_user(username='idle')
+    late = await make_user(username='late')
+
+    async def add(owner, title, created_at, complete=False):
+        await Todo(
+            title=title, description='summary', priority=1, complete=complete,
+            owner_id=str(owner.id), created_at=created_at,
+        ).insert()
+
+    await add(busy, 'done', CUTOFF - timedelta(hours=2), complete=True)
+    await add(busy, 'open', CUTOFF - timedelta(hours=1))
+    await add(busy, 'tomorrow', CUTOFF + timedelta(minutes=1))
+    await add(late, 'after midnight', CUTOFF + timedelta(minutes=5))
+
+    summaries = {
+        summary.username: summary
+        async for summary in iter_user_summaries(
+            [str(busy.id), str(idle.id), str(late.id)], created_before=CUTOFF
+        )
+    }
+
+    assert set(summaries) == {'busy', 'idle', 'late'}
+    assert (summaries['busy'].total, summaries['busy'].completed) == (2, 1)
+    assert [task['title'] for task in summaries['busy'].tasks] == ['done', 'open']
+    assert (summaries['idle'].total, summaries['idle'].tasks) == (0, [])
+    assert summaries['late'].total == 0
@@ -0,0 +1,28 @@
+from ..core.templating import RowFragmentCache, env, precompile_templates
+
+
+def _todo(version=0, title='Write tests'):
+    return {'_id': 'abc123', 'title': title, 'priority': 1, 'complete': False, 'version': version}
+
+
+def test_precompile_loads_every_template():
+    assert precompile_templates() == len(env.list_templates(extensions=['html']))
+
+
+def test_rows_are_reused_until_the_version_changes():
+    cache = RowFragmentCache(env, max_size=10)
+
+    first = cache.render(_todo(), 1)
+    assert cache.render(_todo(), 1) is first
+    assert 'edit-todo-page/abc123' in first
+
+    updated = cache.render(_todo(version=1, title='Write more tests'), 1)
+    assert 'Write more tests' in updated
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_rows_are_escaped():
+    cache = RowFragmentCache(env, max_size=10)
+
+    assert '<script>' not in cache.render(_todo(title='<script>'), 1)
@@ -0,0 +1,165 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Response
+
+from ..models_beanie import Todo
+from ..routers.todos import (
+    _apply_update,
+    _expected_version,
+    _update_pipeline,
+    delete_todo,
+    patch_todo,
+    update_todo,
+)
+from ..schemas.todo import TodoPatch, TodoRequest
+from ..services import stats as stats_service
+
+NOW = datetime(2025, 1, 2, 3, 4, 5)
+
+
+def _request(**fields) -> TodoRequest:
+    return TodoRequest(**{'title': 'write tests', 'description': 'for writes', 'priority': 2, **fields})
+
+
+def test_expected_version_prefers_if_match():
+    assert _expected_version(3, '"7"') == (7, 412)
+    assert _expected_version(3, 'W/"7"') == (7, 412)
+    assert _expected_version(3, None) == (3, 409)
+    assert _expected_version(None, '*') == (None, 409)
+
+
+def test_expected_version_rejects_a_malformed_if_match():
+    with pytest.raises(HTTPException) as excinfo:
+        _expected_version(None, '"abc"')
+
+    assert excinfo.value.status_code == 412
+
+
+def test_update_pipeline_bumps_version_and_stamps_completion():
+    stage = _update_pipeline({'complete': True}, NOW)[0]['$set']
+
+    assert stage['complete'] == {'$literal': True}
+    assert stage['version'] == {'$add': [{'$ifNull': ['$version', 0]}, 1]}
+    assert stage['completed_at'] == {
+        '$cond': [{'$eq': ['$complete', True]}, '$completed_at', {'$literal': NOW}]
+    }
+    assert _update_pipeline({'complete': False}, NOW)[0]['$set']['completed_at'] is None
+    assert 'completed_at' not in _update_pipeline({'title': 'renamed'}, NOW)[0]['$set']
+
+
+def test_apply_update_follows_completion_rules():
+    earlier = datetime(2025, 1, 1)
+
+    completed = _apply_update({'complete': False}, {'complete': True}, NOW)
+    kept = _apply_update({'complete': True, 'completed_at': earlier, 'version': 4}, {'complete': True}, NOW)
+    reopened = _apply_update({'complete': True, 'completed_at': earlier}, {'complete': False}, NOW)
+
+    assert (completed['completed_at'], completed['version']) == (NOW, 1)
+    assert (kept['completed_at'], kept['version']) == (earlier, 5)
+    assert reopened['completed_at'] is None
+
+
+@pytest.mark.asyncio
+async def test_apply_update_matches_what_mongo_stores(make_todo):
+    todo = await make_todo(complete=False)
+    collection = Todo.get_motor_collection()
+    fields = {'title': 'renamed', 'complete': True}
+
+    before = await collection.find_one({'_id': todo.id})
+    await collection.update_one({'_id': todo.id}, _update_pipeline(fields, NOW))
+
+    assert await collection.find_one({'_id': todo.id}) == _apply_update(before, fields, NOW)
+
+
+@pytest.mark.asyncio
+async def test_update_returns_the_new_version_as_etag(make_todo, user):
+    todo = await make_todo(version=3)
+    response = Response()
+
+    await update_todo(user, str(todo.id), _request(complete=True), response, if_match='"3"')
+
+    assert response.headers['ETag'] == '"4"'
+    assert (await Todo.get(todo.id)).priority == 2
+
+
+@pytest.mark.asyncio
+async def test_if_match_version_mismatch_is_412_and_leaves_the_todo(make_todo, user):
+    todo = await make_todo(version=3)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await update_todo(user, str(todo.id), _request(), Response(), if_match='"2"')
+
+    assert excinfo.value.status_code == 412
+    assert (await Todo.get(todo.id)).version == 3
+
+
+@pytest.mark.asyncio
+async def test_body_version_mismatch_is_409(make_todo, user):
+    todo = await make_todo(version=3)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await update_todo(user, str(todo.id), _request(version=2), Response(), if_match=None)
+
+    assert excinfo.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_other_owners_todo_is_404(make_todo, user):
+    todo = await make_todo(version=3)
+    intruder = {**user, 'id': 'intruder'}
+
+    with pytest.raises(HTTPException) as excinfo:
+        await update_todo(intruder, str(todo.id), _request(), Response(), if_match='"3"')
+
+    assert excinfo.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_conditional_delete_keeps_a_changed_todo(make_todo, user):
+    todo = await make_todo(version=3)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await delete_todo(user, str(todo.id), version=None, if_match='"2"')
+    assert excinfo.value.status_code == 412
+
+    await delete_todo(user, str(todo.id), version=3, if_match=None)
+    assert await Todo.get(todo.id) is None
+
+
+@pytest.mark.asyncio
+async def test_patch_writes_only_the_sent_fields(make_todo, user):
+    todo = await make_todo(version=1)
+    response = Response()
+
+    patched = await patch_todo(user, str(todo.id), TodoPatch(complete=True), response, if_match=None)
+
+    assert (patched.title, patched.priority, patched.complete) == ('write tests', 1, True)
+    assert patched.completed_at is not None
+    assert response.headers['ETag'] == '"2"'
+    assert (await stats_service.get_stats('owner'))['completed'] == 1
+
+
+@pytest.mark.asyncio
+async def test_patch_with_a_stale_if_match_is_412(make_todo, user):
+    todo = await make_todo(version=1)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await patch_todo(user, str(todo.id), TodoPatch(title='renamed'), Response(), if_match='"0"')
+
+    assert excinfo.value.status_code == 412
+    assert (await Todo.get(todo.id)).title == 'write tests'
+
+
+@pytest.mark.asyncio
+async def test_empty_patch_returns_the_todo_unchanged(make_todo, user):
+    todo = await make_todo(version=1)
+
+    patched = await patch_todo(user, str(todo.id), TodoPatch(), Response(), if_match=None)
+
+    assert patched.version == 1
+
+
+def test_patch_rejects_explicit_nulls():
+    with pytest.raises(ValueError):
+        TodoPatch(title=None)
@@ -0,0 +1,59 @@
+import time
+
+from ..core.token_cache import TokenCache
+
+
+def _payload(user_id='1', ttl=60):
+    return {'sub': 'testuser', 'id': user_id, 'role': 'user', 'exp': time.time() + ttl}
+
+
+def test_hit_and_miss_counters():
+    cache = TokenCache(max_size=10)
+    payload = _payload()
+
+    assert cache.get('token') is None
+    cache.put('token', payload)
+
+    assert cache.get('token') == payload
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_expired_tokens_are_evicted():
+    cache = TokenCache(max_size=10)
+    cache.put('token', _payload(ttl=-1))
+
+    assert cache.get('token') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = TokenCache(max_size=2)
+    cache.put('a', _payload())
+    cache.put('b', _payload())
+    cache.get('a')
+    cache.put('c', _payload())
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+
+
+def test_invalidate_user():
+    cache = TokenCache(max_size=10)
+    cache.put('a', _payload(user_id='1'))
+    cache.put('b', _payload(user_id='1'))
+    cache.put('c', _payload(user_id='2'))
+
+    cache.invalidate_user('1')
+
+    assert cache.get('a') is None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TokenCache(max_size=0)
+    cache.put('token', _payload())
+
+    assert cache.get('token') is None
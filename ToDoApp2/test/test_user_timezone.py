@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi import HTTPException
+
+from ..models_beanie import User
+from ..routers.todos import _today_label
+from ..routers.users import change_timezone
+from ..schemas.user import TimezoneUpdate
+from ..services.notifications import APP_TZ, next_reset_at
+
+
+def _current(user: User):
+    return {'id': str(user.id), 'username': user.username, 'user_role': user.role}
+
+
+@pytest.mark.asyncio
+async def test_changing_zone_moves_the_next_reset(make_user):
+    user = await make_user(next_reset_at=datetime.utcnow() + timedelta(hours=20))
+
+    await change_timezone(_current(user), TimezoneUpdate(timezone='Asia/Tokyo'))
+
+    stored = await User.get(user.id)
+    assert stored.timezone == 'Asia/Tokyo'
+    assert stored.next_reset_at == next_reset_at(ZoneInfo('Asia/Tokyo'), after=datetime.utcnow())
+    local = stored.next_reset_at.replace(tzinfo=ZoneInfo('UTC')).astimezone(ZoneInfo('Asia/Tokyo'))
+    assert (local.hour, local.minute) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_null_zone_falls_back_to_the_app_timezone(make_user):
+    user = await make_user(timezone='Asia/Tokyo')
+
+    await change_timezone(_current(user), TimezoneUpdate(timezone=None))
+
+    stored = await User.get(user.id)
+    assert stored.timezone is None
+    assert stored.next_reset_at == next_reset_at(APP_TZ)
+
+
+@pytest.mark.asyncio
+async def test_unknown_zone_is_rejected(make_user):
+    user = await make_user(timezone='Asia/Tokyo')
+
+    with pytest.raises(HTTPException) as excinfo:
+        await change_timezone(_current(user), TimezoneUpdate(timezone='Mars/Olympus'))
+
+    assert excinfo.value.status_code == 400
+    assert (await User.get(user.id)).timezone == 'Asia/Tokyo'
+
+
+@pytest.mark.asyncio
+async def test_today_label_uses_the_users_zone(make_user):
+    east = await make_user(username='east', timezone='Pacific/Kiritimati')
+    west = await make_user(username='west', timezone='Pacific/Pago_Pago')
+
+    # UTC+14 and UTC-11 are never on the same calendar day.
+    assert await _today_label(str(east.id)) != await _today_label(str(west.id))
+    today = datetime.now(ZoneInfo('Pacific/Kiritimati')).strftime("%A, %d %B %Y")
+    assert await _today_label(str(east.id)) == today
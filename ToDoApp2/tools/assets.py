@@ -0,0 +1,119 @@
+"""
+Static asset build: content-hashed copies of everything under static/, with
+precompressed .gz and .br siblings and a manifest.json mapping each original
+path to its hashed one. bootstrap.css is purged of unused selectors first
+(see css_purge.py), so templates get the small file through the manifest.
+
+Run it before starting the app (the Dockerfile does):
+
+    python -m ToDoApp2.tools.assets
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+from .css_purge import PURGE_TARGETS, purge_file
+
+try:
+    import brotli  # optional: .br files are skipped without it
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+DIST_DIRNAME = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Files worth compressing; images and fonts are already compressed.
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".map", ".svg", ".json", ".txt", ".html"}
+# Compressed variants smaller than this fraction of the original are kept.
+MIN_COMPRESSION_RATIO = 0.9
+
+
+def content_hash(data: bytes, length: int = 10) -> str:
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def hashed_name(relative: Path, data: bytes) -> Path:
+    """css/base.css -> css/base.<hash>.css"""
+    return relative.with_name(f"{relative.stem}.{content_hash(data)}{relative.suffix}")
+
+
+def write_compressed(target: Path, data: bytes) -> None:
+    """Write .gz (and .br when available) siblings of `target` if they pay off."""
+    if target.suffix not in COMPRESSIBLE_SUFFIXES or not data:
+        return
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data) * MIN_COMPRESSION_RATIO:
+        target.with_name(target.name + ".gz").write_bytes(gz)
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data) * MIN_COMPRESSION_RATIO:
+            target.with_name(target.name + ".br").write_bytes(br)
+
+
+def build_assets(
+    source: Path = STATIC_DIR, out: Optional[Path] = None, purge: bool = True
+) -> Dict[str, str]:
+    """
+    Build fingerprinted, precompressed assets.
+
+    Source maps keep their names, since the bundles reference them by name.
+
+    Args:
+        source: The static directory
+        out: Output directory, defaults to <source>/dist (rebuilt from scratch)
+        purge: Purge and minify the PURGE_TARGETS stylesheets
+
+    Returns:
+        The manifest: original relative path -> hashed relative path
+    """
+    out = out or source / DIST_DIRNAME
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    manifest: Dict[str, str] = {}
+    for path in sorted(source.rglob("*")):
+        if not path.is_file() or out in path.parents:
+            continue
+        relative = path.relative_to(source)
+        if purge and relative.as_posix() in PURGE_TARGETS:
+            css, report = purge_file(path)
+            data = css.encode("utf-8")
+            logger.info("Purged %s\n%s", relative.as_posix(), report.summary())
+        else:
+            data = path.read_bytes()
+        target_relative = relative if relative.suffix == ".map" else hashed_name(relative, data)
+        target = out / target_relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        write_compressed(target, data)
+        manifest[relative.as_posix()] = target_relative.as_posix()
+
+    (out / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    logger.info("Built %s assets into %s", len(manifest), out)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", type=Path, default=STATIC_DIR)
+    parser.add_argument("--out", type=Path, default=None)
+    parser.add_argument("--no-purge", action="store_true", help="Ship stylesheets unpurged")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if brotli is None:
+        logger.warning("brotli is not installed; skipping .br files")
+    build_assets(args.source, args.out, purge=not args.no_purge)
+
+
+if __name__ == "__main__":
+    main()
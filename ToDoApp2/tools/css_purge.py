@@ -0,0 +1,364 @@
+"""
+Template-aware CSS purge: drop the selectors of a stylesheet whose classes
+appear in none of the templates or scripts, then minify what is left.
+
+Any word in a content file counts as a used class, so classes built in
+Jinja expressions or JS strings are kept; classes only added at runtime by
+bootstrap.js belong in the safelist (css_safelist.txt). The asset build
+purges bootstrap.css this way; run this module directly for a size report:
+
+    python -m ToDoApp2.tools.css_purge [--out purged.css]
+"""
+import argparse
+import gzip
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Pattern, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+STATIC_DIR = PACKAGE_DIR / "static"
+DEFAULT_CONTENT = (
+    PACKAGE_DIR / "templates",
+    STATIC_DIR / "js" / "base.js",
+)
+DEFAULT_SAFELIST = Path(__file__).resolve().parent / "css_safelist.txt"
+# Stylesheets the asset build purges, relative to static/
+PURGE_TARGETS = ("css/bootstrap.css",)
+CONTENT_SUFFIXES = {".html", ".js"}
+
+# At-rules whose block holds rules to purge; other blocks are kept whole.
+_GROUPING_AT_RULES = ("@media", "@supports", "@document")
+_WORD = re.compile(r"[A-Za-z0-9_-]+")
+_CLASS = re.compile(r"\.((?:\\.|[\w-])+)")
+_NOT = re.compile(r":not\([^()]*\)")
+_ATTRIBUTE = re.compile(r"\[[^\]]*\]")
+_KEYFRAMES = re.compile(r"@(?:-[a-z]+-)?keyframes\s+([\w-]+)")
+
+
+@dataclass
+class Safelist:
+    names: Set[str]
+    patterns: List[Pattern]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names or any(p.search(name) for p in self.patterns)
+
+
+@dataclass
+class PurgeReport:
+    original_bytes: int
+    purged_bytes: int
+    original_gzip_bytes: int
+    purged_gzip_bytes: int
+    selectors_total: int
+    selectors_kept: int
+
+    def summary(self) -> str:
+        def pct(new: int, old: int) -> str:
+            return f"{100 * (1 - new / old):.0f}% smaller" if old else "-"
+
+        return (
+            f"selectors: {self.selectors_kept}/{self.selectors_total} kept\n"
+            f"raw:  {self.original_bytes:>8,} -> {self.purged_bytes:>8,} bytes "
+            f"({pct(self.purged_bytes, self.original_bytes)})\n"
+            f"gzip: {self.original_gzip_bytes:>8,} -> {self.purged_gzip_bytes:>8,} bytes "
+            f"({pct(self.purged_gzip_bytes, self.original_gzip_bytes)})"
+        )
+
+
+def load_safelist(path: Path = DEFAULT_SAFELIST) -> Safelist:
+    """
+    One entry per line: a class name, or a /regex/ searched against class
+    names. Blank lines and # comments are ignored.
+    """
+    names: Set[str] = set()
+    patterns: List[Pattern] = []
+    if path.exists():
+        for line in path.read_text().splitlines():
+            entry = line.split("#", 1)[0].strip()
+            if len(entry) > 2 and entry.startswith("/") and entry.endswith("/"):
+                patterns.append(re.compile(entry[1:-1]))
+            elif entry:
+                names.add(entry)
+    return Safelist(names, patterns)
+
+
+def collect_used_names(paths: Iterable[Path] = DEFAULT_CONTENT) -> Set[str]:
+    """Every word in the content files (directories are searched recursively)."""
+    used: Set[str] = set()
+    for path in paths:
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for file in files:
+            if file.is_file() and file.suffix in CONTENT_SUFFIXES:
+                used.update(_WORD.findall(file.read_text(encoding="utf-8")))
+    return used
+
+
+# --- parsing -----------------------------------------------------------------
+
+Node = Tuple[str, Union[str, List["Node"]]]  # (prelude, declarations | children)
+
+
+def _skip_string(css: str, i: int) -> int:
+    """Index just past the string literal starting at css[i]."""
+    quote = css[i]
+    i += 1
+    while i < len(css) and css[i] != quote:
+        i += 2 if css[i] == "\\" else 1
+    return i + 1
+
+
+def _strip_comments(css: str) -> Tuple[List[str], str]:
+    """Remove comments, returning the /*! license */ ones separately."""
+    licenses: List[str] = []
+    out: List[str] = []
+    i = 0
+    while i < len(css):
+        if css[i] in "\"'":
+            end = _skip_string(css, i)
+            out.append(css[i:end])
+            i = end
+        elif css.startswith("/*", i):
+            end = css.find("*/", i + 2)
+            end = len(css) if end < 0 else end + 2
+            if css.startswith("/*!", i):
+                licenses.append(css[i:end])
+            i = end
+        else:
+            out.append(css[i])
+            i += 1
+    return licenses, "".join(out)
+
+
+def _parse(css: str, i: int = 0) -> Tuple[List[Node], int]:
+    """Parse rules up to the closing brace of the current block."""
+    nodes: List[Node] = []
+    start = i
+    while i < len(css):
+        char = css[i]
+        if char in "\"'":
+            i = _skip_string(css, i)
+        elif char == ";":  # statement at-rule: @charset, @import
+            nodes.append((css[start:i].strip(), ""))
+            i += 1
+            start = i
+        elif char == "}":
+            return nodes, i + 1
+        elif char == "{":
+            prelude = css[start:i].strip()
+            if prelude.lower().startswith(_GROUPING_AT_RULES):
+                children, i = _parse(css, i + 1)
+                nodes.append((prelude, children))
+            else:
+                body_start, depth = i + 1, 1
+                i += 1
+                while i < len(css) and depth:
+                    if css[i] in "\"'":
+                        i = _skip_string(css, i)
+                        continue
+                    depth += {"{": 1, "}": -1}.get(css[i], 0)
+                    i += 1
+                nodes.append((prelude, css[body_start:i - 1]))
+            start = i
+        else:
+            i += 1
+    return nodes, i
+
+
+def split_selectors(prelude: str) -> List[str]:
+    """Split a selector list on top-level commas."""
+    parts: List[str] = []
+    depth, start, i = 0, 0, 0
+    while i < len(prelude):
+        char = prelude[i]
+        if char in "\"'":
+            i = _skip_string(prelude, i)
+            continue
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(prelude[start:i].strip())
+            start = i + 1
+        i += 1
+    parts.append(prelude[start:].strip())
+    return [part for part in parts if part]
+
+
+def selector_classes(selector: str) -> Set[str]:
+    """Classes a selector needs; those under :not() and in attributes do not count."""
+    selector = _ATTRIBUTE.sub("", selector)
+    while True:
+        stripped = _NOT.sub("", selector)
+        if stripped == selector:
+            break
+        selector = stripped
+    return {name.replace("\\", "") for name in _CLASS.findall(selector)}
+
+
+# --- minifying ---------------------------------------------------------------
+
+def _minify(text: str, tight: str) -> str:
+    """Collapse whitespace outside strings and drop it next to `tight` chars."""
+    out: List[str] = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in "\"'":
+            end = _skip_string(text, i)
+            out.append(text[i:end])
+            i = end
+        elif char.isspace():
+            while i < len(text) and text[i].isspace():
+                i += 1
+            previous = out[-1][-1:] if out else ""
+            following = text[i:i + 1]
+            if previous and following and previous not in tight and following not in tight:
+                out.append(" ")
+        else:
+            out.append(char)
+            i += 1
+    return "".join(out)
+
+
+def _minify_selector(selector: str) -> str:
+    # Not ':' or '(' - whitespace there is a descendant combinator.
+    return _minify(selector, ",>+~")
+
+
+def _minify_block(body: str) -> str:
+    return _minify(body, "{}:;,>").rstrip(";").replace(";}", "}")
+
+
+# --- purging -----------------------------------------------------------------
+
+def _walk_rules(nodes: Sequence[Node]) -> Iterable[Node]:
+    for prelude, body in nodes:
+        if isinstance(body, list):
+            yield from _walk_rules(body)
+        elif not prelude.startswith("@"):
+            yield prelude, body
+
+
+def _purge_nodes(nodes: Sequence[Node], keep: Set[str], counts: List[int]) -> List[Node]:
+    kept: List[Node] = []
+    for prelude, body in nodes:
+        if isinstance(body, list):
+            children = _purge_nodes(body, keep, counts)
+            if children:
+                kept.append((prelude, children))
+        elif prelude.startswith("@"):
+            kept.append((prelude, body))
+        else:
+            selectors = split_selectors(prelude)
+            used = [s for s in selectors if selector_classes(s) <= keep]
+            counts[0] += len(selectors)
+            counts[1] += len(used)
+            if used:
+                kept.append((",".join(_minify_selector(s) for s in used), body))
+    return kept
+
+
+def _drop_unused_keyframes(nodes: List[Node], declarations: str) -> List[Node]:
+    kept: List[Node] = []
+    for prelude, body in nodes:
+        match = _KEYFRAMES.match(prelude)
+        if match and not re.search(rf"(?<![\w-]){re.escape(match.group(1))}(?![\w-])", declarations):
+            continue
+        if isinstance(body, list):
+            body = _drop_unused_keyframes(body, declarations)
+        kept.append((prelude, body))
+    return kept
+
+
+def _declarations(nodes: Sequence[Node]) -> str:
+    return " ".join(
+        _declarations(body) if isinstance(body, list) else body
+        for prelude, body in nodes
+        if not _KEYFRAMES.match(prelude)
+    )
+
+
+def _serialize(nodes: Sequence[Node]) -> str:
+    out: List[str] = []
+    for prelude, body in nodes:
+        prelude = _minify(prelude, ",:") if prelude.startswith("@") else prelude
+        if isinstance(body, list):
+            out.append(f"{prelude}{{{_serialize(body)}}}")
+        elif not body and prelude.startswith("@"):
+            out.append(f"{prelude};")
+        else:
+            out.append(f"{prelude}{{{_minify_block(body)}}}")
+    return "".join(out)
+
+
+def purge_css(css: str, used: Set[str], safelist: Optional[Safelist] = None) -> Tuple[str, int, int]:
+    """
+    Purge and minify a stylesheet.
+
+    A selector is kept when every class it needs is used or safelisted;
+    selectors without classes (elements, attributes, :root) are always kept.
+    Keyframes no kept rule refers to are dropped; /*! license */ comments stay.
+
+    Args:
+        css: The stylesheet
+        used: Class names in use (see collect_used_names)
+        safelist: Classes to keep regardless
+
+    Returns:
+        (purged css, selectors seen, selectors kept)
+    """
+    safelist = safelist or Safelist(set(), [])
+    licenses, css = _strip_comments(css)
+    nodes, _ = _parse(css)
+    names = {name for prelude, _ in _walk_rules(nodes) for name in selector_classes(prelude)}
+    keep = {name for name in names if name in used or name in safelist}
+
+    counts = [0, 0]
+    kept = _purge_nodes(nodes, keep, counts)
+    kept = _drop_unused_keyframes(kept, _declarations(kept))
+    header = "".join(license + "\n" for license in licenses)
+    return header + _serialize(kept) + "\n", counts[0], counts[1]
+
+
+def purge_file(
+    path: Path,
+    content: Iterable[Path] = DEFAULT_CONTENT,
+    safelist_path: Path = DEFAULT_SAFELIST,
+) -> Tuple[str, PurgeReport]:
+    """Purge one stylesheet against the content files; returns (css, report)."""
+    original = path.read_text(encoding="utf-8")
+    purged, total, kept = purge_css(original, collect_used_names(content), load_safelist(safelist_path))
+    original_bytes, purged_bytes = original.encode(), purged.encode()
+    report = PurgeReport(
+        original_bytes=len(original_bytes),
+        purged_bytes=len(purged_bytes),
+        original_gzip_bytes=len(gzip.compress(original_bytes, 9)),
+        purged_gzip_bytes=len(gzip.compress(purged_bytes, 9)),
+        selectors_total=total,
+        selectors_kept=kept,
+    )
+    return purged, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Purge unused selectors from a stylesheet.")
+    parser.add_argument("stylesheet", type=Path, nargs="?", default=STATIC_DIR / PURGE_TARGETS[0])
+    parser.add_argument("--content", type=Path, nargs="+", default=list(DEFAULT_CONTENT))
+    parser.add_argument("--safelist", type=Path, default=DEFAULT_SAFELIST)
+    parser.add_argument("--out", type=Path, help="Write the purged stylesheet here")
+    args = parser.parse_args()
+
+    purged, report = purge_file(args.stylesheet, args.content, args.safelist)
+    if args.out:
+        args.out.write_text(purged, encoding="utf-8")
+    print(f"{args.stylesheet}\n{report.summary()}")
+
+
+if __name__ == "__main__":
+    main()